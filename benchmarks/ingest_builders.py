@@ -0,0 +1,184 @@
+"""
+Time the columnar record builders against the old one-DataFrame-per-row ingest.
+
+Seasons are read from the response cache, so run the app (or `ad_hoc.py`) once
+to record the league first; after that the benchmark does no network I/O.
+
+    python -m benchmarks.ingest_builders --league-id 298982 --start-year 2011
+
+Without a recorded league, --synthetic builds that many seasons of a made-up
+10-team league in memory instead:
+
+    python -m benchmarks.ingest_builders --synthetic 14
+"""
+#%% Modules
+import argparse
+import random
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+from espn_api.football import constant
+
+from ffa import ingest
+from ffa.cache import CachedLeague
+
+#%% Parameters
+# ESPN slot ids each synthetic position is eligible for (QB, RB, WR, TE, D/ST, K, plus flex, bench and IR)
+SYNTHETIC_SLOTS = {'QB': [0, 7, 20, 21], 'RB': [2, 3, 23, 7, 20, 21], 'WR': [4, 3, 5, 23, 7, 20, 21],
+                   'TE': [6, 5, 23, 7, 20, 21], 'D/ST': [16, 20, 21], 'K': [17, 20, 21]}
+
+# players per position in the synthetic pro-player catalog
+SYNTHETIC_CATALOG = {'QB': 100, 'RB': 250, 'WR': 350, 'TE': 150, 'D/ST': 32, 'K': 60}
+
+
+#%% Old Row-Wise Ingest
+def parse_season_rowwise(league):
+    scores_df = []
+    acq_df = []
+    draft_board = []
+    player_lookup = []
+    season_weeks = league.settings.reg_season_count
+
+    for team in league.teams:
+        team_data = league.get_team_data(team.team_id)
+        if team_data is None:
+            continue
+        opponent_list = pd.DataFrame({'opponent': [opp.owners[0]['firstName'] + ' ' + opp.owners[0]['lastName'] for opp in team_data.schedule],
+                                      'outcome': team_data.outcomes,
+                                      'points_for': team_data.scores,
+                                      'mov': team_data.mov})
+        opponent_list['manager'] = team_data.owners[0]['firstName'] + ' ' + team_data.owners[0]['lastName']
+        opponent_list['game_type'] = 'postseason'
+        opponent_list['week'] = np.arange(opponent_list.shape[0]) + 1
+        opponent_list.iloc[:season_weeks, 5] = 'season'
+        opponent_list['year'] = league.year
+        scores_df.append(opponent_list)
+
+        acq_df.append(pd.DataFrame({'team_id': [team_data.owners[0]['firstName'] + ' ' + team_data.owners[0]['lastName']],
+                                    'pickups': [team_data.acquisitions],
+                                    'trades': [team_data.trades],
+                                    'faab_used': [team_data.acquisition_budget_spent],
+                                    'year': [league.year]}))
+
+    for draft_pick in league.draft:
+        draft_board.append(pd.DataFrame({'round': [draft_pick.round_num],
+                                         'pick': [draft_pick.round_pick],
+                                         'player': [draft_pick.playerName],
+                                         'manager': [draft_pick.team.owners[0]['firstName'] + ' ' + draft_pick.team.owners[0]['lastName']],
+                                         'year': [league.year]}))
+
+    for player_info in league.espn_request.get_pro_players():
+        if 'eligibleSlots' not in player_info.keys():
+            continue
+        for pos in player_info['eligibleSlots']:
+            if (pos != 25 and '/' not in constant.POSITION_MAP[pos]) or '/' in player_info['fullName']:
+                position = constant.POSITION_MAP[pos]
+                break
+        player_lookup.append(pd.DataFrame({'position': [position],
+                                           'player': [player_info['fullName']],
+                                           'year': [league.year]}))
+
+    return scores_df, acq_df, draft_board, player_lookup
+
+
+def build_rowwise(leagues):
+    seasons = [parse_season_rowwise(league) for league in leagues]
+    return [pd.concat(sum([season[i] for season in seasons], [])) for i in range(4)]
+
+
+def build_columnar(leagues):
+    seasons = [ingest.parse_season(league) for league in leagues]
+    tables = [ingest.build_table(name, seasons) for name in ['scores', 'acquisitions', 'draft']]
+    return tables + [pd.concat([season['players'] for season in seasons])]
+
+
+#%% Synthetic League
+def synthetic_league(year, teams = 10, weeks = 17, rounds = 16, seed = 0):
+    """
+    a made-up season with the attributes both builders read from an espn_api League
+    """
+    rng = random.Random(seed * 10_000 + year)
+    catalog = []
+    for position, count in SYNTHETIC_CATALOG.items():
+        for k in range(count):
+            catalog.append({'id': len(catalog) + 1, 'fullName': f'{position} Player {k}', 'eligibleSlots': SYNTHETIC_SLOTS[position]})
+
+    league_teams = [SimpleNamespace(team_id = i + 1,
+                                    owners = [{'id': f'{{OWNER-{i}}}', 'firstName': f'first{i}', 'lastName': f'last{i}'}],
+                                    schedule = [], outcomes = [], scores = [], mov = [],
+                                    acquisitions = rng.randint(0, 40), trades = rng.randint(0, 5), acquisition_budget_spent = rng.randint(0, 100))
+                    for i in range(teams)]
+
+    for _ in range(weeks):
+        order = rng.sample(league_teams, teams)
+        for home, away in zip(order[::2], order[1::2]):
+            home_score, away_score = round(rng.uniform(60, 160), 2), round(rng.uniform(60, 160), 2)
+            for team, opponent, points_for, points_against in [(home, away, home_score, away_score), (away, home, away_score, home_score)]:
+                team.schedule.append(opponent)
+                team.scores.append(points_for)
+                team.mov.append(points_for - points_against)
+                team.outcomes.append('W' if points_for > points_against else 'L' if points_for < points_against else 'T')
+
+    picks = rng.sample(catalog, rounds * teams)
+    draft = [SimpleNamespace(round_num = pick // teams + 1, round_pick = pick % teams + 1, playerName = player['fullName'],
+                             playerId = player['id'], team = league_teams[pick % teams])
+             for pick, player in enumerate(picks)]
+
+    team_data = {team.team_id: team for team in league_teams}
+    standings = rng.sample(league_teams, teams)
+
+    return SimpleNamespace(year = year,
+                           teams = league_teams,
+                           draft = draft,
+                           settings = SimpleNamespace(reg_season_count = 14, playoff_team_count = 6,
+                                                      position_slot_counts = {'QB': 1, 'RB': 2, 'WR': 2, 'TE': 1, 'RB/WR/TE': 1,
+                                                                              'D/ST': 1, 'K': 1, 'BE': 7, 'IR': 1}),
+                           get_team_data = team_data.get,
+                           standings = lambda: standings,
+                           espn_request = SimpleNamespace(get_pro_players = lambda: catalog))
+
+
+#%% Benchmark
+def best_time(func, leagues, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(leagues)
+        timings.append(time.perf_counter() - start)
+
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description = 'Benchmark the ingest record builders on a recorded or synthetic league.')
+    source = parser.add_mutually_exclusive_group(required = True)
+    source.add_argument('--league-id', type = int)
+    source.add_argument('--synthetic', type = int, metavar = 'SEASONS', help = 'time this many seasons of a made-up league instead')
+    parser.add_argument('--start-year', type = int, default = 2011)
+    parser.add_argument('--espn-s2', default = None)
+    parser.add_argument('--swid', default = None)
+    parser.add_argument('--repeat', type = int, default = 3)
+    args = parser.parse_args()
+
+    if args.synthetic is not None:
+        leagues = [synthetic_league(args.start_year + i) for i in range(args.synthetic)]
+    else:
+        # the responses come from the cache; read the pro-player catalog once so only the builders are timed
+        leagues = [CachedLeague(args.league_id, int(year), args.espn_s2, args.swid) for year in ingest.season_years(args.start_year)]
+        for league in leagues:
+            pro_players = league.espn_request.get_pro_players()
+            league.espn_request.get_pro_players = lambda pro_players = pro_players: pro_players
+
+    rowwise = best_time(build_rowwise, leagues, args.repeat)
+    columnar = best_time(build_columnar, leagues, args.repeat)
+
+    print(f'seasons:  {len(leagues)}')
+    print(f'row-wise: {rowwise:.3f}s')
+    print(f'columnar: {columnar:.3f}s')
+    print(f'speedup:  {rowwise / columnar:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
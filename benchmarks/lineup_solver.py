@@ -0,0 +1,125 @@
+"""
+Time the batched exact lineup solver against the old slot-by-slot greedy search.
+
+Lineups are synthetic (10 teams, 17 weeks, 15 seasons by default) with a flex slot, which is
+where the greedy search can leave points on the bench by filling RB/WR before RB/WR/TE.
+
+    python -m benchmarks.lineup_solver
+"""
+#%% Modules
+import argparse
+import random
+import time
+
+import numpy as np
+import pandas as pd
+
+from ffa.lineups import LineupPlayer
+from ffa.solver import solve_lineups
+
+#%% Parameters
+POSITIONS = {'QB': 1, 'RB': 2, 'RB/WR': 1, 'WR': 2, 'TE': 1, 'RB/WR/TE': 1, 'D/ST': 1, 'K': 1, 'BE': 7, 'IR': 1}
+ELIGIBLE_SLOTS = {'QB': ['QB', 'OP', 'BE', 'IR'],
+                  'RB': ['RB', 'RB/WR', 'RB/WR/TE', 'OP', 'BE', 'IR'],
+                  'WR': ['WR', 'RB/WR', 'WR/TE', 'RB/WR/TE', 'OP', 'BE', 'IR'],
+                  'TE': ['TE', 'WR/TE', 'RB/WR/TE', 'OP', 'BE', 'IR'],
+                  'D/ST': ['D/ST', 'BE', 'IR'],
+                  'K': ['K', 'BE', 'IR']}
+ROSTER = [('QB', 2), ('RB', 5), ('WR', 5), ('TE', 2), ('D/ST', 1), ('K', 1)]
+
+
+#%% Old Greedy Search
+def find_optimal_lineup(week, positions, lineup):
+    optimal_positions = []
+    optimal_players = []
+
+    for position in positions:
+        if position in ['BE', 'IR']:
+            continue
+        if positions[position] != 0:
+            n_players = positions[position]
+            optimal_positions.append(np.repeat(position, n_players))
+
+            eligible_players = []
+            for player in lineup:
+                if position in player.eligibleSlots:
+                    eligible_players.append(player)
+
+            eligible_players = sorted(eligible_players, key = lambda x: x.points, reverse = True)[:n_players]
+            optimal_players.extend(eligible_players)
+
+            for player in eligible_players:
+                lineup.remove(player)
+
+    optimal_lineup_df = pd.DataFrame({
+        'optimal_positions': sum([pos.tolist() for pos in optimal_positions], []),
+        'optimal_players': [player.name for player in optimal_players]
+    })
+    optimal_lineup_df['week'] = week
+
+    optimal_score = np.sum([player.points for player in optimal_players])
+
+    return optimal_lineup_df, optimal_score
+
+
+#%% Synthetic League
+def synthetic_seasons(teams, weeks, years, seed = 0):
+    """
+    one list of lineups per season, every team-week a fresh roster of random scorers
+    """
+    rng = random.Random(seed)
+    seasons = []
+    for _ in range(years):
+        lineups = []
+        for _ in range(teams * weeks):
+            lineups.append([LineupPlayer(f'{position} {k}', 'BE', ELIGIBLE_SLOTS[position], round(rng.uniform(0, 30), 2), 0.0)
+                            for position, count in ROSTER for k in range(count)])
+        seasons.append(lineups)
+
+    return seasons
+
+
+def greedy(seasons):
+    return [[find_optimal_lineup(1, POSITIONS, list(lineup))[1] for lineup in lineups] for lineups in seasons]
+
+
+def batched(seasons):
+    return [[score for _, _, score in solve_lineups(POSITIONS, lineups)] for lineups in seasons]
+
+
+#%% Benchmark
+def best_time(func, seasons, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(seasons)
+        timings.append(time.perf_counter() - start)
+
+    return min(timings), np.concatenate([np.array(season, dtype = float) for season in result])
+
+
+def main():
+    parser = argparse.ArgumentParser(description = 'Benchmark the batched lineup solver on a synthetic league.')
+    parser.add_argument('--teams', type = int, default = 10)
+    parser.add_argument('--weeks', type = int, default = 17)
+    parser.add_argument('--years', type = int, default = 15)
+    parser.add_argument('--repeat', type = int, default = 3)
+    args = parser.parse_args()
+
+    seasons = synthetic_seasons(args.teams, args.weeks, args.years)
+    greedy_time, greedy_scores = best_time(greedy, seasons, args.repeat)
+    batched_time, batched_scores = best_time(batched, seasons, args.repeat)
+
+    # the exact solver can never do worse than greedy
+    assert (batched_scores >= greedy_scores - 1e-9).all()
+    missed = batched_scores - greedy_scores > 1e-9
+
+    print(f'team-weeks:        {greedy_scores.shape[0]}')
+    print(f'greedy:            {greedy_time:.3f}s')
+    print(f'batched:           {batched_time:.3f}s')
+    print(f'speedup:           {greedy_time / batched_time:.1f}x')
+    print(f'greedy suboptimal: {missed.mean():.1%} of team-weeks, {np.sum(batched_scores - greedy_scores):.1f} points in total')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+Time the vectorized playoff-odds simulator on a synthetic league with half a season left.
+
+    python -m benchmarks.playoff_odds --simulations 100000
+"""
+#%% Modules
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from ffa.playoffs import playoff_odds
+
+
+#%% Synthetic League
+def synthetic_scores(teams, weeks, played_weeks, seed = 0):
+    """
+    a round-robin-ish regular season in scores_df layout, with the games after played_weeks unplayed
+    """
+    rng = np.random.default_rng(seed)
+    managers = [f'Manager {i:02d}' for i in range(teams)]
+    strength = rng.normal(110, 10, size = teams)
+
+    rows = []
+    for week in range(1, weeks + 1):
+        order = rng.permutation(teams)
+        for home, away in zip(order[::2], order[1::2]):
+            played = week <= played_weeks
+            home_score = round(rng.normal(strength[home], 25), 2) if played else 0
+            away_score = round(rng.normal(strength[away], 25), 2) if played else 0
+            for team, opponent, points_for, points_against in [(home, away, home_score, away_score), (away, home, away_score, home_score)]:
+                outcome = 'U' if not played else 'W' if points_for > points_against else 'L' if points_for < points_against else 'T'
+                rows.append((managers[opponent], outcome, points_for, points_for - points_against, managers[team], 'season', week, 2025, points_against))
+
+    return pd.DataFrame(rows, columns = ['opponent', 'outcome', 'points_for', 'mov', 'manager', 'game_type', 'week', 'year', 'points_against'])
+
+
+#%% Benchmark
+def main():
+    parser = argparse.ArgumentParser(description = 'Benchmark the Monte Carlo playoff-odds simulator.')
+    parser.add_argument('--teams', type = int, default = 12)
+    parser.add_argument('--weeks', type = int, default = 14)
+    parser.add_argument('--played-weeks', type = int, default = 7)
+    parser.add_argument('--simulations', type = int, default = 100_000)
+    parser.add_argument('--repeat', type = int, default = 3)
+    args = parser.parse_args()
+
+    scores_df = synthetic_scores(args.teams, args.weeks, args.played_weeks)
+
+    timings = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        odds = playoff_odds(scores_df, 2025, simulations = args.simulations, seed = 0)
+        timings.append(time.perf_counter() - start)
+
+    print(odds.drop(['year', 'week'], axis = 1).sort_values('playoff', ascending = False).to_string(index = False))
+    print(f'teams: {args.teams}, remaining games: {(scores_df["outcome"] == "U").sum() // 2}, simulations: {args.simulations}')
+    print(f'best of {args.repeat}: {min(timings):.3f}s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,3 @@
+"""
+Fantasy football analysis helpers shared by the Streamlit pages and ad-hoc scripts.
+"""
@@ -0,0 +1,61 @@
+"""
+Build the local store without the Streamlit app, e.g. from a nightly job:
+
+    python -m ffa ingest --league-id 298982 --start-year 2011 --espn-s2 ... --swid ...
+
+The cookies can also come from the FFA_ESPN_S2 and FFA_SWID environment variables so
+they stay out of the process list. The app opens whatever store this leaves behind.
+"""
+#%% Modules
+import argparse
+import os
+import sys
+import time
+
+from ffa import ingest
+from ffa import store
+from ffa import warehouse
+
+
+#%% Commands
+def ingest_command(args):
+    if args.espn_s2 is None or args.swid is None:
+        sys.exit('ingest needs --espn-s2 and --swid (or FFA_ESPN_S2 and FFA_SWID)')
+
+    start = time.perf_counter()
+    master_data, derived_tables = store.build_store(args.league_id,
+                                                    args.start_year,
+                                                    args.espn_s2,
+                                                    args.swid,
+                                                    full = args.full,
+                                                    current_year = args.current_year,
+                                                    max_workers = args.max_workers,
+                                                    root = args.warehouse)
+
+    for name, df in list(zip(warehouse.MASTER_TABLES, master_data)) + list(derived_tables.items()):
+        print(f'{name:<18} {df.shape[0]:>8} rows')
+    print(f'built league {args.league_id} into {args.warehouse} in {time.perf_counter() - start:.1f}s')
+
+
+#%% Entry Point
+def main(argv = None):
+    parser = argparse.ArgumentParser(prog = 'python -m ffa', description = 'Fantasy football analysis data tools.')
+    commands = parser.add_subparsers(dest = 'command', required = True)
+
+    ingest_parser = commands.add_parser('ingest', help = 'fetch a league and precompute every table into the local store')
+    ingest_parser.add_argument('--league-id', type = int, required = True)
+    ingest_parser.add_argument('--start-year', type = int, required = True, help = 'inaugural season of the league')
+    ingest_parser.add_argument('--espn-s2', default = os.environ.get('FFA_ESPN_S2'))
+    ingest_parser.add_argument('--swid', default = os.environ.get('FFA_SWID'))
+    ingest_parser.add_argument('--full', action = 'store_true', help = 'rebuild from scratch instead of refreshing the stored league')
+    ingest_parser.add_argument('--current-year', type = int, default = ingest.CURRENT_YEAR)
+    ingest_parser.add_argument('--max-workers', type = int, default = ingest.MAX_WORKERS)
+    ingest_parser.add_argument('--warehouse', default = warehouse.WAREHOUSE_DIR, help = 'store directory (default: %(default)s)')
+    ingest_parser.set_defaults(func = ingest_command)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
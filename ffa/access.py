@@ -0,0 +1,37 @@
+#%% Modules
+import hashlib
+import os
+
+import requests
+from espn_api.requests.espn_requests import EspnFantasyRequests
+
+from ffa.cache import REQUEST_TIMEOUT
+from ffa.ingest import CURRENT_YEAR
+
+
+#%% Open Leagues
+def open_leagues():
+    """
+    league ids this deployment opens to every visitor without cookies, from FFA_OPEN_LEAGUES (comma separated)
+    """
+    return [int(league_id) for league_id in os.environ.get('FFA_OPEN_LEAGUES', '').split(',') if league_id.strip()]
+
+
+#%% Credentials
+def credentials_digest(espn_s2, swid):
+    """
+    a stand-in for a pair of cookies in cache keys, so the cookies themselves are never hashed into a key
+    """
+    return hashlib.sha256(f'{espn_s2}\n{swid}'.encode()).hexdigest()
+
+
+def cookies_accepted(league_id, espn_s2, swid, year = CURRENT_YEAR):
+    """
+    whether ESPN serves the league to these cookies
+
+    asked of ESPN directly: the response cache is shared by everyone, so a cached league says nothing about the cookies
+    """
+    request = EspnFantasyRequests(sport = 'nfl', year = year, league_id = league_id, cookies = {'espn_s2': espn_s2, 'SWID': swid})
+    response = requests.get(request.LEAGUE_ENDPOINT, params = {'view': 'mSettings'}, cookies = request.cookies, timeout = REQUEST_TIMEOUT)
+
+    return response.status_code == 200
@@ -0,0 +1,21 @@
+#%% All-Play Records
+def all_play_records(scores_df):
+    """
+    every regular season score played against the whole league that week, for every season at once
+
+    total_wins counts the scores strictly below, total_loss the ones strictly above and
+    total_ties the rest of the league, so equal scores tie each other
+    """
+    all_play_df = scores_df[(scores_df['outcome'] != 'U') & (scores_df['game_type'] == 'season')].copy()
+
+    weeks = all_play_df.groupby(['year', 'week'])['points_for']
+    teams = weeks.transform('size')
+    below = weeks.rank(method = 'min') - 1
+    not_above = weeks.rank(method = 'max')
+
+    all_play_df['total_wins'] = below.astype(int)
+    all_play_df['total_loss'] = (teams - not_above).astype(int)
+    all_play_df['total_ties'] = (not_above - below - 1).astype(int)
+
+    return all_play_df.sort_values(['year', 'week', 'points_for'], kind = 'stable').reset_index(drop = True)
+
@@ -0,0 +1,167 @@
+#%% Modules
+import datetime
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import requests
+from espn_api.football import League
+from espn_api.requests.espn_requests import ESPNAccessDenied, ESPNInvalidLeague, ESPNUnknownError, EspnFantasyRequests
+
+#%% Parameters
+# where raw ESPN responses are kept between runs
+CACHE_DIR = Path(os.environ.get('FFA_CACHE_DIR', '.ffa_cache'))
+
+# completed seasons never expire; the current season is re-fetched after this many seconds
+CURRENT_SEASON_TTL = 60 * 60
+
+# a season's last fantasy week is played by early January, so it is over by this (month, day) of the next year
+SEASON_END = (2, 1)
+
+
+# seconds an ESPN request may wait on its socket before it fails (and is retried)
+REQUEST_TIMEOUT = 30
+
+
+def season_end(year):
+    return datetime.datetime(year + 1, *SEASON_END).timestamp()
+
+
+#%% Request Status
+def check_status(status, league_id):
+    """
+    espn_api's errors for a failed response
+    """
+    if status == 401:
+        raise ESPNAccessDenied(f'League {league_id} cannot be accessed with the provided credentials')
+    elif status == 404:
+        raise ESPNInvalidLeague(f'League {league_id} does not exist')
+    elif status != 200:
+        raise ESPNUnknownError(f'ESPN returned an HTTP {status}')
+
+
+#%% Response Cache
+class ResponseCache:
+    """
+    raw ESPN json on disk, keyed by (league_id, year, endpoint, week)
+    """
+    def __init__(self, cache_dir = CACHE_DIR, current_year = None, ttl = CURRENT_SEASON_TTL):
+        self.cache_dir = Path(cache_dir)
+        self.current_year = datetime.date.today().year if current_year is None else current_year
+        self.ttl = ttl
+
+    def path(self, league_id, year, endpoint, week, digest):
+        return self.cache_dir / str(league_id) / str(year) / endpoint / f'week_{week}_{digest}.json'
+
+    def is_fresh(self, path, year):
+        if not path.exists():
+            return False
+
+        # past seasons never change, but only responses written once the season was over are final;
+        # one cached while games were still being played expires like the current season
+        written = path.stat().st_mtime
+        if year < self.current_year and written >= season_end(year):
+            return True
+
+        return time.time() - written < self.ttl
+
+    def get(self, path, year):
+        if not self.is_fresh(path, year):
+            return None
+
+        with open(path) as f:
+            return json.load(f)
+
+    def put(self, path, response):
+        path.parent.mkdir(parents = True, exist_ok = True)
+
+        # write then rename so concurrent readers never see half a file; every writer gets its own temp file,
+        # so two processes caching the same response can't clobber each other's
+        with tempfile.NamedTemporaryFile('w', dir = path.parent, prefix = path.name + '.', suffix = '.tmp', delete = False) as f:
+            json.dump(response, f)
+        os.replace(f.name, path)
+
+
+def endpoint_name(kind, params, extend):
+    view = (params or {}).get('view', 'base')
+    if isinstance(view, list):
+        view = '-'.join(view)
+
+    # extend holds the league id for some requests, keep only the last path segment
+    extend = extend.strip('/').split('/')[-1] if extend else ''
+
+    return '_'.join(part for part in [kind, view, extend] if part)
+
+
+class CachedEspnRequests(EspnFantasyRequests):
+    """
+    EspnFantasyRequests that reads league and season requests from a ResponseCache first
+
+    requests that miss the cache are made here rather than by espn_api, which sets no timeout:
+    a dead connection would otherwise hold its worker thread forever
+    """
+    def __init__(self, sport, year, league_id, cookies = None, logger = None, cache = None, timeout = REQUEST_TIMEOUT):
+        super().__init__(sport = sport, year = year, league_id = league_id, cookies = cookies, logger = logger)
+        self.cache = ResponseCache() if cache is None else cache
+        self.timeout = timeout
+
+    def _fetch(self, endpoint, params, headers):
+        r = requests.get(endpoint, params = params, headers = headers, cookies = self.cookies, timeout = self.timeout)
+        check_status(r.status_code, self.league_id)
+        response = r.json()
+
+        if self.logger:
+            self.logger.log_request(endpoint = endpoint, params = params, headers = headers, response = response)
+
+        return response
+
+    def _league_get(self, params = None, headers = None, extend = ''):
+        response = self._fetch(self.LEAGUE_ENDPOINT + extend, params, headers)
+
+        # seasons before 2018 come from leagueHistory, which wraps the league in a list
+        return response[0] if isinstance(response, list) else response
+
+    def _get(self, params = None, headers = None, extend = ''):
+        return self._fetch(self.ENDPOINT + extend, params, headers)
+
+    def _cached(self, kind, fetch, params, headers, extend):
+        week = (params or {}).get('scoringPeriodId', 0)
+        request_id = json.dumps([kind, params, headers, extend], sort_keys = True, default = str)
+        digest = hashlib.sha1(request_id.encode()).hexdigest()[:12]
+        path = self.cache.path(self.league_id, self.year, endpoint_name(kind, params, extend), week, digest)
+
+        response = self.cache.get(path, self.year)
+        if response is None:
+            response = fetch(params = params, headers = headers, extend = extend)
+            self.cache.put(path, response)
+
+        return response
+
+    def league_get(self, params = None, headers = None, extend = ''):
+        return self._cached('league', self._league_get, params, headers, extend)
+
+    def get(self, params = None, headers = None, extend = ''):
+        return self._cached('season', self._get, params, headers, extend)
+
+
+#%% Cached League
+class CachedLeague(League):
+    """
+    drop-in League whose requests (league, box_scores, get_pro_players, ...) go through the disk cache
+    """
+    def __init__(self, league_id, year, espn_s2 = None, swid = None, cache = None):
+        self.cache = ResponseCache() if cache is None else cache
+        super().__init__(league_id, year, espn_s2, swid)
+
+    def fetch_league(self):
+        # swap in the caching requester before the first request is made
+        self.espn_request = CachedEspnRequests(sport = 'nfl',
+                                               year = self.year,
+                                               league_id = self.league_id,
+                                               cookies = self.espn_request.cookies,
+                                               logger = self.logger,
+                                               cache = self.cache)
+        super().fetch_league()
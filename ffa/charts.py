@@ -0,0 +1,57 @@
+#%% Modules
+import numpy as np
+import pandas as pd
+
+#%% Parameters
+# most games a time series chart is drawn over; longer histories are thinned to this many
+MAX_CHART_GAMES = 200
+
+
+#%% Win % Time Series
+def win_pct_series(scores_df, game_types):
+    """
+    every manager's cumulative win % after each played game of `game_types`, one row per (manager, year, week)
+    """
+    played = scores_df[scores_df['game_type'].isin(game_types) & (scores_df['outcome'] != 'U')]
+    tally = (played.groupby(['manager', 'year', 'week', 'outcome'], observed = True)['opponent']
+                   .count()
+                   .unstack('outcome', fill_value = 0)
+                   .reindex(columns = ['W', 'L', 'T'], fill_value = 0)
+                   .reset_index()
+                   .rename_axis(None, axis = 1))
+
+    counts = tally.groupby('manager')[['W', 'L', 'T']].cumsum()
+    series = tally.loc[:, ['manager', 'year', 'week']]
+    series['win_pct'] = (counts['W'] + 0.5 * counts['T']) / (counts['W'] + counts['L'] + counts['T'])
+
+    return series
+
+
+def downsample_games(series_df, max_games = MAX_CHART_GAMES):
+    """
+    keep at most about `max_games` evenly spaced games of a time series, always including the last game of each season
+
+    the win % is cumulative, so the thinned line looks the same while the chart's size stays flat as history grows
+    """
+    games = series_df.loc[:, ['year', 'week']].drop_duplicates().sort_values(['year', 'week']).reset_index(drop = True)
+    if games.shape[0] > max_games:
+        step = int(np.ceil(games.shape[0] / max_games))
+        season_end = games['year'] != games['year'].shift(-1)
+        games = games[(games.index % step == 0) | season_end]
+
+    series_df = pd.merge(series_df, games, on = ['year', 'week'])
+    series_df['game_id'] = series_df['year'].astype(str) + '-' + series_df['week'].astype(str)
+
+    return series_df.sort_values(['year', 'week', 'manager']).reset_index(drop = True)
+
+
+def membership_timeline(scores_df):
+    """
+    the first and last season each manager played in, sorted by when they joined
+    """
+    played = scores_df[scores_df['outcome'] != 'U']
+    membership = played.groupby('manager', as_index = False)['year'].agg(['min', 'max'])
+    membership.columns = ['manager', 'year_min', 'year_max']
+    membership['year_end'] = membership['year_max'] + 1
+
+    return membership.sort_values(['year_min', 'year_max'], ascending = [True, False]).reset_index(drop = True)
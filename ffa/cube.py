@@ -0,0 +1,44 @@
+#%% Modules
+import pandas as pd
+
+#%% Parameters
+CUBE_KEYS = ['manager', 'opponent', 'year', 'game_type']
+CUBE_MEASURES = ['wins', 'losses', 'ties', 'points_for', 'points_against']
+
+
+#%% Matchup Cube
+def matchup_cube(scores_df):
+    """
+    W/L/T counts and points for/against of every played game, summed per (manager, opponent, year, game_type)
+    """
+    played = scores_df[scores_df['outcome'] != 'U']
+    cube = (played.assign(wins = played['outcome'] == 'W',
+                          losses = played['outcome'] == 'L',
+                          ties = played['outcome'] == 'T')
+                  .groupby(CUBE_KEYS, as_index = False, observed = True)[CUBE_MEASURES]
+                  .sum())
+
+    return cube.astype({'wins': int, 'losses': int, 'ties': int})
+
+
+def cube_slice(cube, managers = None, opponents = None, years = None, game_types = None):
+    """
+    the cells of the cube matching every filter that is given
+    """
+    keep = pd.Series(True, index = cube.index)
+    for column, values in zip(CUBE_KEYS, [managers, opponents, years, game_types]):
+        if values is not None:
+            keep &= cube[column].isin(values)
+
+    return cube[keep]
+
+
+def cube_totals(cube, by):
+    """
+    roll the cube up to `by`, with the record and win % of each group
+    """
+    totals = cube.groupby(by, as_index = False, observed = True)[CUBE_MEASURES].sum()
+    totals['record'] = totals['wins'].astype(str) + '-' + totals['losses'].astype(str) + '-' + totals['ties'].astype(str)
+    totals['win_pct'] = round((totals['wins'] + 0.5 * totals['ties']) / (totals['wins'] + totals['losses'] + totals['ties']) * 100, 2)
+
+    return totals
@@ -0,0 +1,111 @@
+#%% Modules
+import threading
+
+import streamlit as st
+from streamlit import session_state as ss
+
+from ffa import registry
+from ffa import store
+from ffa import warehouse
+
+#%% Shared Registry
+@st.cache_resource
+def dataset_registry():
+    # one registry per server process: every session and league shares it
+    return registry.DatasetRegistry()
+
+
+#%% Background Imports
+class LeagueImport:
+    """
+    a league being built into the store on its own thread, one season at a time
+
+    pages open whatever seasons have landed while it runs, and leaving the homepage does not stop it
+    """
+    def __init__(self, league_id, league_start, espn_s2, swid):
+        self.league_id = league_id
+        self.landed = []
+        self.importing = None
+        self.error = None
+        self.finished = threading.Event()
+
+        self._thread = threading.Thread(target = self._run, args = (league_start, espn_s2, swid), daemon = True)
+        self._thread.start()
+
+    def _progress(self, year, importing):
+        self.importing = importing
+        self.landed.append(year)
+
+    def _run(self, league_start, espn_s2, swid):
+        try:
+            store.build_store(self.league_id, league_start, espn_s2, swid, progress = self._progress)
+        except Exception as error:
+            self.error = error
+        finally:
+            self.finished.set()
+
+    @property
+    def fraction(self):
+        # nothing is known about the total until the first season lands
+        if self.importing is None:
+            return 0.0
+
+        return len(self.landed) / (len(self.landed) + len(self.importing))
+
+
+#%% Page Tables
+def league_manifest():
+    league_id = ss.get('league_id', False)
+
+    return None if league_id is False else warehouse.read_manifest(league_id)
+
+
+def league_version():
+    """
+    (league id, store version) of the opened league, a cache key for anything computed from its tables
+    """
+    league_id = ss.get('league_id', False)
+
+    return league_id, None if league_id is False else warehouse.manifest_version(league_id)
+
+
+def league_table(name, required = True):
+    """
+    one table of the league opened on the homepage, read from the store the first time any session asks for it
+
+    a table no landed season has yet stops the page, or comes back as None when it is not `required`
+    """
+    league_id = ss.get('league_id', False)
+    if league_id is False:
+        st.write('Open a league on the homepage first.')
+        st.stop()
+
+    # a new version means more seasons (or a refresh) have landed since the table was loaded
+    df = dataset_registry().load(league_id, name, lambda: store.load_store_table(name, league_id),
+                                 version = warehouse.manifest_version(league_id))
+    if df is None and required:
+        st.write('This part of the league has not been imported yet, check back once more seasons are in.')
+        st.stop()
+
+    return df
+
+
+def league_years(all_years):
+    """
+    the seasons of `all_years` that have landed in the store
+    """
+    manifest = league_manifest()
+    if manifest is None:
+        return all_years
+
+    return all_years[[year in manifest['years'] for year in all_years]]
+
+
+def import_notice():
+    """
+    a note on pages opened while the league is still being imported
+    """
+    manifest = league_manifest()
+    if manifest is not None and len(manifest.get('importing', [])) > 0:
+        total = len(manifest['years']) + len(manifest['importing'])
+        st.info(f"Still importing: {len(manifest['years'])} of {total} seasons are in so far. Rerun the page to pick up new ones.")
@@ -0,0 +1,70 @@
+#%% Modules
+import numpy as np
+import pandas as pd
+
+#%% Parameters
+DRAFT_VALUE_COLUMNS = ['year', 'round', 'pick', 'player_id', 'player', 'manager', 'position', 'points', 'replacement', 'vorp']
+
+# positions each flex slot can hold; a flex slot counts towards each of them equally
+FLEX_POSITIONS = {'RB/WR': ['RB', 'WR'], 'WR/TE': ['WR', 'TE'], 'RB/WR/TE': ['RB', 'WR', 'TE'], 'OP': ['QB', 'RB', 'WR', 'TE']}
+NON_STARTERS = ['BE', 'IR']
+
+
+#%% Replacement Levels
+def starters_per_team(roster_slots):
+    """
+    (year, position, starters) with flex slots spread evenly over the positions they can hold
+    """
+    slots = roster_slots[~roster_slots['slot'].isin(NON_STARTERS) & (roster_slots['count'] > 0)]
+    flex = pd.DataFrame([(slot, position) for slot, positions in FLEX_POSITIONS.items() for position in positions], columns = ['slot', 'position'])
+
+    shares = pd.merge(slots, flex, how = 'left', on = 'slot')
+    shares['position'] = shares['position'].fillna(shares['slot'])
+    shares['starters'] = shares['count'] / shares.groupby(['year', 'slot'])['slot'].transform('size')
+
+    return shares.groupby(['year', 'position'], as_index = False)['starters'].sum()
+
+
+def replacement_levels(season_points, roster_slots, teams):
+    """
+    season points of the first player past the league's starters at each position, per year
+
+    a league starting 2 RBs with 10 teams is replaced by the 21st best RB; positions with too few
+    players fall back to the worst one
+    """
+    levels = starters_per_team(roster_slots[roster_slots['year'].isin(teams.index)])
+    levels['rank'] = np.ceil(levels['starters'] * levels['year'].map(teams)).astype(int) + 1
+
+    ranked = season_points.assign(rank = season_points.groupby(['year', 'position'])['points'].rank(method = 'first', ascending = False).astype(int))
+    at_rank = pd.merge(levels, ranked, how = 'left', on = ['year', 'position', 'rank'])
+    worst = ranked.groupby(['year', 'position'])['points'].min().rename('worst')
+
+    at_rank = pd.merge(at_rank, worst, how = 'left', left_on = ['year', 'position'], right_index = True)
+    at_rank['replacement'] = at_rank['points'].fillna(at_rank['worst'])
+
+    return at_rank.loc[:, ['year', 'position', 'replacement']]
+
+
+#%% Draft Value
+def draft_value(draft_board_df, player_weeks_df, roster_slots_df):
+    """
+    points above replacement of every drafted player with box scores, joined on (year, player_id)
+    """
+    # a player's season is every week they spent on a roster in this league
+    season_points = (player_weeks_df.groupby(['year', 'player_id'], as_index = False)
+                                    .agg(points = ('points', 'sum'), position = ('position', 'first')))
+    teams = player_weeks_df.groupby('year')['manager'].nunique()
+    replacement = replacement_levels(season_points, roster_slots_df, teams)
+
+    # seasons before box scores have no points to value
+    drafted = draft_board_df[draft_board_df['year'].isin(teams.index)]
+    value = pd.merge(drafted.loc[:, ['year', 'round', 'pick', 'player_id', 'player', 'manager', 'position']],
+                     season_points.loc[:, ['year', 'player_id', 'points']],
+                     how = 'left',
+                     on = ['year', 'player_id'])
+    value['points'] = value['points'].fillna(0)
+
+    value = pd.merge(value, replacement, how = 'left', on = ['year', 'position'])
+    value['vorp'] = value['points'] - value['replacement']
+
+    return value.loc[:, DRAFT_VALUE_COLUMNS]
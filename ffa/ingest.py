@@ -0,0 +1,354 @@
+#%% Modules
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+
+from ffa import managers
+from ffa import players
+from ffa import schema
+from ffa import warehouse
+from ffa.cache import CachedLeague, ResponseCache
+from ffa.lineups import concat_lineups, lineup_pool, lineup_weeks, season_lineups
+from ffa.scheduler import TokenBucket
+
+#%% Parameters
+# current_year = datetime.date.today().year
+CURRENT_YEAR = 2025
+
+# how many seasons are fetched from ESPN at the same time
+MAX_WORKERS = 8
+
+
+#%% Season Helpers
+def season_years(league_start, current_year = CURRENT_YEAR):
+    all_years = np.arange(league_start, current_year + 1)
+
+    # remove 2018 as its a problem (TO FIX)
+    index_2018 = np.where(all_years == 2018)
+    if index_2018[0].shape[0] == 1:
+        all_years = np.delete(all_years, index_2018)
+
+    return all_years
+
+
+#%% Columnar Record Builders
+# column order of each table, matching the frames the pages expect
+TABLE_COLUMNS = {
+    'scores': ['opponent', 'outcome', 'points_for', 'mov', 'manager', 'game_type', 'week', 'year'],
+    'standings': ['Manager', 'Result', 'Year'],
+    'acquisitions': ['team_id', 'pickups', 'trades', 'faab_used', 'year'],
+    'draft': ['round', 'pick', 'player', 'player_id', 'manager', 'year'],
+    'roster_slots': ['slot', 'count', 'year'],
+    'season_settings': ['playoff_team_count', 'playoff_seed_tie_rule', 'year']
+}
+
+
+def new_table(name):
+    return {column: [] for column in TABLE_COLUMNS[name]}
+
+
+def build_table(name, seasons):
+    """
+    build one DataFrame from the column lists of every season, in a single allocation
+    """
+    return pd.DataFrame({column: list(chain.from_iterable(season[name][column] for season in seasons))
+                         for column in TABLE_COLUMNS[name]})
+
+
+def parse_season(league, fetch_players = True):
+    """
+    parse a fetched League into plain column lists per table
+    """
+    scores = new_table('scores')
+    standings = new_table('standings')
+    acquisitions = new_table('acquisitions')
+    draft = new_table('draft')
+    roster_slots = new_table('roster_slots')
+    season_settings = new_table('season_settings')
+
+    season_weeks = league.settings.reg_season_count
+    teams = league.teams
+    team_ids = [team.team_id for team in teams]
+
+    # loop through the teams in the year
+    for id in team_ids:
+        team_data = league.get_team_data(id)
+
+        # some managers' data has been purged
+        if team_data is None:
+            continue
+
+        num_games = len(team_data.schedule)
+        manager = managers.owner_id(team_data)
+        scores['opponent'].extend([managers.owner_id(opp) for opp in team_data.schedule])
+        scores['outcome'].extend(team_data.outcomes)
+        scores['points_for'].extend(team_data.scores)
+        scores['mov'].extend(team_data.mov)
+        scores['manager'].extend([manager] * num_games)
+        scores['game_type'].extend(['season' if week < season_weeks else 'postseason' for week in range(num_games)])
+        scores['week'].extend(range(1, num_games + 1))
+        scores['year'].extend([league.year] * num_games)
+
+        # acquisition data
+        acquisitions['team_id'].append(manager)
+        acquisitions['pickups'].append(team_data.acquisitions)
+        acquisitions['trades'].append(team_data.trades)
+        acquisitions['faab_used'].append(team_data.acquisition_budget_spent)
+        acquisitions['year'].append(league.year)
+
+    # the final standings of the year
+    final_standings = [managers.owner_id(team) for team in league.standings()]
+    standings['Manager'].extend(final_standings)
+    standings['Result'].extend(range(1, len(final_standings) + 1))
+    standings['Year'].extend([league.year] * len(final_standings))
+
+    # collect draft values here
+    for draft_pick in league.draft:
+        draft['round'].append(draft_pick.round_num)
+        draft['pick'].append(draft_pick.round_pick)
+        draft['player'].append(draft_pick.playerName)
+        draft['player_id'].append(draft_pick.playerId)
+        draft['manager'].append(managers.owner_id(draft_pick.team))
+        draft['year'].append(league.year)
+
+    # starting and bench slots the league plays with
+    for slot, count in league.settings.position_slot_counts.items():
+        roster_slots['slot'].append(slot)
+        roster_slots['count'].append(count)
+        roster_slots['year'].append(league.year)
+
+    # the playoff bracket the season was played with and how tied records are seeded (older espn_api versions lack the rule)
+    season_settings['playoff_team_count'].append(league.settings.playoff_team_count)
+    season_settings['playoff_seed_tie_rule'].append(getattr(league.settings, 'playoff_seed_tie_rule', None))
+    season_settings['year'].append(league.year)
+
+    # the pro-player catalog is only pulled for seasons missing from the player dimension
+    player_dim = None
+    if fetch_players:
+        player_dim = players.build_player_dim(league.espn_request.get_pro_players(), league.year)
+
+    # tables hold owner ids until they are swapped for manager keys
+    owners = {managers.owner_id(team): managers.owner_name(team) for team in teams}
+
+    return {'scores': scores,
+            'standings': standings,
+            'acquisitions': acquisitions,
+            'draft': draft,
+            'roster_slots': roster_slots,
+            'season_settings': season_settings,
+            'players': player_dim,
+            'owners': owners}
+
+
+def fetch_season(league_id, year, espn_s2, swid, current_year = CURRENT_YEAR, cache = None, start_week = 1, fetch_players = True,
+                 pool = None, bucket = None):
+    """
+    pull one season from ESPN (or the response cache) and parse it into the per-table pieces
+
+    its box scores are fetched and its lineups solved (in the shared process `pool`) right here, so seasons
+    do both alongside each other
+    """
+    league = CachedLeague(league_id, int(year), espn_s2, swid, cache = cache)
+    season = parse_season(league, fetch_players)
+
+    # lineups are compared for every finished week with box scores
+    season['league'] = league
+    season['lineups'] = season_lineups(league, lineup_weeks(league, current_year, start_week), pool, bucket)
+
+    return season
+
+
+def stream_seasons(league_id, years, espn_s2, swid, current_year = CURRENT_YEAR, max_workers = MAX_WORKERS, cache = None, start_weeks = None, player_years = ()):
+    """
+    fetch and parse every season in parallel, yielding each one in the order of `years` as soon as it is in
+    """
+    # completed seasons are cached forever, the current one expires
+    if cache is None:
+        cache = ResponseCache(current_year = current_year)
+
+    # first lineup week to pull for each season
+    if start_weeks is None:
+        start_weeks = {}
+
+    # player positions can still change during the current season
+    fetch_players = {year: year == current_year or year not in player_years for year in years}
+
+    # every season's box scores share one rate limit, and its lineups one process pool
+    bucket = TokenBucket()
+    with lineup_pool() as process_pool, ThreadPoolExecutor(max_workers = max(1, min(max_workers, len(years)))) as pool:
+        yield from pool.map(lambda year: fetch_season(league_id, year, espn_s2, swid, current_year, cache, start_weeks.get(year, 1), fetch_players[year],
+                                                      process_pool, bucket),
+                            years)
+
+
+def load_seasons(league_id, years, espn_s2, swid, current_year = CURRENT_YEAR, max_workers = MAX_WORKERS, cache = None, start_weeks = None, player_years = ()):
+    """
+    fetch and parse every season in parallel; results come back in the order of `years`
+    """
+    return list(stream_seasons(league_id, years, espn_s2, swid, current_year, max_workers, cache, start_weeks, player_years))
+
+
+def update_player_dim(player_dim, seasons, league_id, root = warehouse.WAREHOUSE_DIR):
+    """
+    upsert the freshly fetched seasons into the stored player dimension and persist them under `root`
+    """
+    new_dims = [season['players'] for season in seasons if season['players'] is not None]
+    if len(new_dims) == 0:
+        return player_dim
+
+    new_player_dim = pd.concat(new_dims)
+    players.save_player_dim(new_player_dim, league_id, root = root)
+
+    return upsert(player_dim, new_player_dim, ['year'])
+
+
+def season_owners(seasons):
+    """
+    {owner_id: (latest espn name, first year)} over the parsed seasons
+    """
+    owners = {}
+    for season in sorted(seasons, key = lambda season: season['league'].year):
+        for owner, name in season['owners'].items():
+            owners[owner] = (name, owners.get(owner, (name, season['league'].year))[1])
+
+    return owners
+
+
+def combine_seasons(seasons, player_dim, manager_dim):
+    """
+    stitch parsed seasons back together into the master frames, in year order
+    """
+    # owner ids become small manager keys; names are only looked up when a page renders
+    keys = managers.owner_keys(manager_dim)
+
+    # each table is built once from its columns
+    scores_df = build_table('scores', seasons)
+    scores_df['manager'] = scores_df['manager'].map(keys)
+    scores_df['opponent'] = scores_df['opponent'].map(keys)
+    scores_df['points_against'] = scores_df['points_for'] - scores_df['mov']
+
+    standings_df = build_table('standings', seasons)
+    standings_df['Manager'] = standings_df['Manager'].map(keys)
+
+    acq_df = build_table('acquisitions', seasons)
+    acq_df['team_id'] = acq_df['team_id'].map(keys)
+
+    draft_board_df = build_table('draft', seasons)
+    draft_board_df['manager'] = draft_board_df['manager'].map(keys)
+
+    roster_slots_df = build_table('roster_slots', seasons)
+    season_settings_df = build_table('season_settings', seasons)
+
+    all_comps_df, all_scores_df, player_weeks_df = concat_lineups([season['lineups'] for season in seasons])
+    all_scores_df['manager'] = all_scores_df['manager'].map(keys)
+    all_comps_df['manager'] = all_comps_df['manager'].map(keys)
+    player_weeks_df['manager'] = player_weeks_df['manager'].map(keys)
+
+    # add draft position to the draft
+    draft_board_df['player_pos'] = draft_board_df['player'] + ' (' + draft_board_df['round'].astype(str) + '.' + draft_board_df['pick'].astype(str) + ')'
+
+    # add playing position to the draft
+    draft_board_df = pd.merge(draft_board_df,
+                              player_dim.loc[:, ['player_id', 'year', 'position']],
+                              how = 'left',
+                              on = ['player_id', 'year'])
+
+    return schema.apply_master_schema((scores_df, standings_df, acq_df, draft_board_df, all_comps_df, all_scores_df, player_weeks_df, roster_slots_df, season_settings_df, manager_dim))
+
+
+#%% Create Master Dataframe that will hold all data
+def upsert(stored_df, new_df, keys):
+    """
+    replace the rows of stored_df that share `keys` with new_df, then append the rest
+    """
+    if new_df.shape[0] == 0:
+        return stored_df
+    if stored_df.shape[0] == 0:
+        return new_df.sort_values(keys, kind = 'stable').reset_index(drop = True)
+
+    stale = pd.MultiIndex.from_frame(stored_df[keys]).isin(pd.MultiIndex.from_frame(new_df[keys].drop_duplicates()))
+    merged_df = pd.concat([stored_df[~stale], new_df])
+
+    return merged_df.sort_values(keys, kind = 'stable').reset_index(drop = True)
+
+
+def merge_master_data(master_data, new_data):
+    """
+    fold freshly combined seasons into the master frames; the manager dimension is taken from `new_data`
+    """
+    # season-level tables are replaced a whole year at a time, lineups a week at a time
+    keys = [['year'], ['Year'], ['year'], ['year'], ['year', 'week'], ['year', 'week'], ['year', 'week'], ['year'], ['year']]
+
+    return tuple(upsert(df, new_df, table_keys) for df, new_df, table_keys in zip(master_data, new_data, keys)) + (new_data[-1],)
+
+
+def refresh_years(master_data, league_start, current_year = CURRENT_YEAR):
+    """
+    seasons the master data is missing or has not finished; every season when there is no master data
+    """
+    all_years = season_years(league_start, current_year)
+    if master_data is None:
+        return list(all_years)
+
+    # a season is done once it is in the past, has no unplayed games left and landed whole: its settings row is written
+    # with the rest of the season. a season without lineup comparisons (no box scores from ESPN) is done all the same
+    scores_df, season_settings_df = master_data[0], master_data[8]
+    unfinished = set(scores_df.loc[scores_df['outcome'] == 'U', 'year'])
+    landed = set(season_settings_df['year'])
+
+    return [year for year in all_years if year not in landed or year in unfinished or year == current_year]
+
+
+def stream_master_data(league_id, league_start, espn_s2, swid, master_data = None, current_year = CURRENT_YEAR, max_workers = MAX_WORKERS, cache = None,
+                       root = warehouse.WAREHOUSE_DIR):
+    """
+    fetch the seasons `master_data` is missing, yielding (year, master data so far) as each one lands, oldest first
+
+    without stored master data every season is fetched; seasons are folded in one at a time so the
+    first one can be shown while the rest are still being pulled
+    """
+    years = refresh_years(master_data, league_start, current_year)
+    if len(years) == 0:
+        return
+
+    # pick up the lineup comparisons after the last stored week
+    start_weeks = None
+    if master_data is not None:
+        stored_weeks = master_data[5].groupby('year')['week'].max()
+        start_weeks = {year: int(stored_weeks.get(year, 0)) + 1 for year in years}
+
+    # positions come from the stored player dimension, only missing seasons are fetched;
+    # manager keys carry over from an earlier build, so a full rebuild keeps them stable
+    player_dim = players.load_player_dim(league_id, root)
+    manager_dim = managers.load_manager_dim(league_id, root) if master_data is None else master_data[-1]
+
+    for season in stream_seasons(league_id, years, espn_s2, swid, current_year, max_workers, cache, start_weeks,
+                                 player_years = set(player_dim['year'])):
+        player_dim = update_player_dim(player_dim, [season], league_id, root)
+        manager_dim = managers.update_manager_dim(manager_dim, season_owners([season]))
+        new_data = combine_seasons([season], player_dim, manager_dim)
+        master_data = new_data if master_data is None else merge_master_data(master_data, new_data)
+
+        yield season['league'].year, master_data
+
+
+def create_master_data(league_id, league_start, espn_s2, swid, current_year = CURRENT_YEAR, max_workers = MAX_WORKERS, cache = None,
+                       root = warehouse.WAREHOUSE_DIR):
+    master_data = None
+    for _, master_data in stream_master_data(league_id, league_start, espn_s2, swid, None, current_year, max_workers, cache, root):
+        pass
+
+    return master_data
+
+
+def refresh_master_data(master_data, league_id, league_start, espn_s2, swid, current_year = CURRENT_YEAR, max_workers = MAX_WORKERS, cache = None,
+                        root = warehouse.WAREHOUSE_DIR):
+    """
+    delta refresh: only fetch seasons that are missing or unfinished and only the lineup weeks not stored yet
+    """
+    for _, master_data in stream_master_data(league_id, league_start, espn_s2, swid, master_data, current_year, max_workers, cache, root):
+        pass
+
+    return master_data
@@ -0,0 +1,218 @@
+#%% Modules
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from ffa.managers import owner_id
+from ffa.scheduler import fetch_box_scores
+from ffa.solver import NON_STARTERS, solve_lineups
+
+#%% Parameters
+# worker processes used to solve lineups
+PROCESS_WORKERS = os.cpu_count() or 1
+
+
+#%% Lineup Helpers
+COMPS_COLUMNS = ['optimal_positions', 'optimal_players', 'week', 'manager', 'og_lineup_pos', 'og_lineup_name', 'year']
+SCORES_COLUMNS = ['manager', 'week', 'score', 'type', 'year']
+# `week` is ESPN's scoring period, `matchup_period` the game it counts towards (the `week` of the scores table)
+PLAYER_WEEK_COLUMNS = ['player_id', 'player', 'position', 'slot', 'points', 'projected_points', 'week', 'matchup_period', 'manager', 'year']
+
+# ESPN only serves box scores from this season on
+BOX_SCORE_START = 2019
+
+# plain, picklable copy of a BoxPlayer so weeks can be shipped to worker processes
+LineupPlayer = namedtuple('LineupPlayer', ['name', 'lineupSlot', 'eligibleSlots', 'points', 'projected_points', 'playerId', 'position', 'points_breakdown'],
+                          defaults = [None, None, None])
+
+
+def lineup_weeks(league, current_year, start_week = 1):
+    """
+    finished weeks of a season that have box scores, from start_week on
+    """
+    if league.year < BOX_SCORE_START:
+        return []
+
+    # the current week of the current season is still being played
+    last_week = league.current_week - 1 if league.year == current_year else league.current_week
+
+    return list(range(start_week, last_week + 1))
+
+
+def scoring_period_matchups(settings):
+    """
+    scoring period -> matchup period; playoff rounds can span several scoring periods, e.g. {15: 15, 16: 15}
+
+    one to one when ESPN does not send the schedule
+    """
+    matchup_periods = getattr(settings, 'matchup_periods', None) or {}
+
+    return {int(scoring_period): int(matchup_period)
+            for matchup_period, scoring_periods in matchup_periods.items()
+            for scoring_period in scoring_periods}
+
+
+def week_task(league, week, week_box_scores):
+    """
+    strip a week of box scores down to (year, week, positions, [(manager, lineup)], matchup period)
+    """
+    teams = []
+
+    # all the home teams first, then the away teams
+    for side in ['home', 'away']:
+        for box_score in week_box_scores:
+            team = getattr(box_score, side + '_team')
+            lineup = getattr(box_score, side + '_lineup')
+
+            # playoff byes have no opponent
+            if not team:
+                continue
+
+            manager = owner_id(team)
+            teams.append((manager, [LineupPlayer(player.name, player.lineupSlot, player.eligibleSlots, player.points, player.projected_points, player.playerId, player.position,
+                                                 stat_breakdown(player))
+                                    for player in lineup]))
+
+    return league.year, week, league.settings.position_slot_counts, teams, scoring_period_matchups(league.settings).get(week, week)
+
+
+def stat_breakdown(player):
+    """
+    the fantasy points a player got from each stat, e.g. {'lostFumbles': -2.0}; ESPN sends 0 when there are none
+    """
+    breakdown = getattr(player, 'points_breakdown', None)
+    if not isinstance(breakdown, dict):
+        return {}
+
+    return {stat: points for stat, points in breakdown.items() if stat not in PLAYER_WEEK_COLUMNS}
+
+
+def breakdown_frame(breakdowns):
+    """
+    one float column per stat any player scored in, zero where a player did not
+    """
+    breakdown_df = pd.DataFrame.from_records(breakdowns)
+
+    return breakdown_df.reindex(columns = sorted(breakdown_df.columns)).fillna(0).astype('float32')
+
+
+def original_lineup(lineup):
+    """
+    the starters a manager actually played, with their actual and projected totals
+    """
+    starters = [player for player in lineup if player.lineupSlot not in NON_STARTERS]
+    og_score = np.sum([player.points for player in starters])
+    projected_score = np.sum([player.projected_points for player in starters])
+
+    return [player.lineupSlot for player in starters], [player.name for player in starters], og_score, projected_score
+
+
+def compare_season(tasks):
+    """
+    optimal vs. original vs. projected lineups for every team-week of one season, solved as one batch
+    """
+    year, _, positions, _, _ = tasks[0]
+    team_weeks = [(week, manager, lineup) for _, week, _, teams, _ in tasks for manager, lineup in teams]
+    matchups = {week: matchup_period for _, week, _, _, matchup_period in tasks}
+    optimal = solve_lineups(positions, [lineup for _, _, lineup in team_weeks])
+
+    comps = {column: [] for column in COMPS_COLUMNS}
+    scores = {column: [] for column in SCORES_COLUMNS}
+    player_weeks = {column: [] for column in PLAYER_WEEK_COLUMNS}
+    breakdowns = []
+    for (week, manager, lineup), (optimal_positions, optimal_players, optimal_score) in zip(team_weeks, optimal):
+        og_positions, og_names, og_score, projected_score = original_lineup(lineup)
+
+        # line the original starters up with the optimal slots, unmatched slots last
+        slot_order = {slot: i for i, slot in enumerate(dict.fromkeys(optimal_positions))}
+        og_order = sorted(range(len(og_positions)), key = lambda i: slot_order.get(og_positions[i], len(slot_order)))
+        og_positions = [og_positions[i] if og_positions[i] in slot_order else None for i in og_order]
+        og_names = [og_names[i] for i in og_order]
+
+        num_rows = max(len(optimal_positions), len(og_positions))
+        padding = [None] * num_rows
+        comps['optimal_positions'].extend((optimal_positions + padding)[:num_rows])
+        comps['optimal_players'].extend((optimal_players + padding)[:num_rows])
+        comps['week'].extend([week] * num_rows)
+        comps['manager'].extend([manager] * num_rows)
+        comps['og_lineup_pos'].extend((og_positions + padding)[:num_rows])
+        comps['og_lineup_name'].extend((og_names + padding)[:num_rows])
+        comps['year'].extend([year] * num_rows)
+
+        scores['manager'].extend([manager] * 3)
+        scores['week'].extend([week] * 3)
+        scores['score'].extend([og_score, optimal_score - og_score, projected_score])
+        scores['type'].extend(['original', 'optimal', 'projected'])
+        scores['year'].extend([year] * 3)
+
+        # every rostered player's week, starters and bench alike
+        player_weeks['player_id'].extend([player.playerId for player in lineup])
+        player_weeks['player'].extend([player.name for player in lineup])
+        player_weeks['position'].extend([player.position for player in lineup])
+        player_weeks['slot'].extend([player.lineupSlot for player in lineup])
+        player_weeks['points'].extend([player.points for player in lineup])
+        player_weeks['projected_points'].extend([player.projected_points for player in lineup])
+        player_weeks['week'].extend([week] * len(lineup))
+        player_weeks['matchup_period'].extend([matchups[week]] * len(lineup))
+        player_weeks['manager'].extend([manager] * len(lineup))
+        player_weeks['year'].extend([year] * len(lineup))
+        breakdowns.extend([player.points_breakdown or {} for player in lineup])
+
+    # the stat breakdown is flattened next to the points, one column per stat
+    player_weeks_df = pd.concat([pd.DataFrame(player_weeks), breakdown_frame(breakdowns)], axis = 1)
+
+    return pd.DataFrame(comps), pd.DataFrame(scores), player_weeks_df
+
+
+def lineup_pool(max_workers = PROCESS_WORKERS):
+    """
+    the process pool seasons are solved in; one is shared by every season of an ingest
+    """
+    return ProcessPoolExecutor(max_workers = max(1, max_workers))
+
+
+def season_lineups(league, weeks, pool = None, bucket = None):
+    """
+    lineup comparisons for some weeks of one season: box scores fetched concurrently, then solved as one batch in `pool`
+
+    each season's fetch thread calls this, so seasons fetch and solve alongside each other while sharing
+    the rate limit `bucket` and the pool's processes
+    """
+    if len(weeks) == 0:
+        return None
+
+    all_box_scores = fetch_box_scores([(league, week) for week in weeks], bucket = bucket)
+    tasks = [week_task(league, week, week_box_scores) for week, week_box_scores in zip(weeks, all_box_scores)]
+
+    return compare_season(tasks) if pool is None else pool.submit(compare_season, tasks).result()
+
+
+def concat_lineups(results):
+    """
+    stack per-season lineup comparisons (None for a season without any) into the three lineup tables
+    """
+    results = [result for result in results if result is not None]
+    if len(results) == 0:
+        return pd.DataFrame(columns = COMPS_COLUMNS), pd.DataFrame(columns = SCORES_COLUMNS), pd.DataFrame(columns = PLAYER_WEEK_COLUMNS)
+
+    return tuple(pd.concat([result[i] for result in results]).reset_index(drop = True) for i in range(3))
+
+
+def gather_all_optimal(league_weeks, max_workers = PROCESS_WORKERS):
+    """
+    lineup comparisons for a list of (league, week) pairs across any number of seasons
+    """
+    # fetch every week at once, then solve each season as one batch in parallel processes
+    all_box_scores = fetch_box_scores(league_weeks)
+    seasons = {}
+    for (league, week), week_box_scores in zip(league_weeks, all_box_scores):
+        seasons.setdefault(league.year, []).append(week_task(league, week, week_box_scores))
+
+    if len(seasons) == 0:
+        return concat_lineups([])
+
+    with ProcessPoolExecutor(max_workers = max(1, min(max_workers, len(seasons)))) as pool:
+        return concat_lineups(pool.map(compare_season, seasons.values()))
@@ -0,0 +1,60 @@
+#%% Modules
+import numpy as np
+import pandas as pd
+
+#%% Parameters
+SWAP_COLUMNS = ['manager', 'schedule_of', 'wins', 'losses', 'ties', 'year']
+
+
+#%% Schedule Swaps
+def season_swaps(season_df):
+    """
+    N x N win/loss/tie counts for one season: row i is manager i's scores played against manager j's schedule
+
+    when j's schedule has i as the opponent, i plays j that week instead; the diagonal is the real record
+    """
+    scores = season_df.pivot_table(index = 'manager', columns = 'week', values = 'points_for')
+    opponents = season_df.pivot(index = 'manager', columns = 'week', values = 'opponent').reindex(index = scores.index, columns = scores.columns)
+
+    # only weeks every manager played
+    complete = scores.notna().all(axis = 0) & opponents.isin(scores.index).all(axis = 0)
+    scores = scores.loc[:, complete]
+    opponents = opponents.loc[:, complete]
+
+    managers = scores.index.to_numpy()
+    team_index = pd.Series(np.arange(managers.shape[0]), index = managers)
+    score_grid = scores.to_numpy()
+    opponent_grid = team_index[opponents.to_numpy().ravel()].to_numpy().reshape(opponents.shape)
+
+    # (manager i, schedule of j, week) grid of i's opponent under j's schedule
+    teams = np.arange(managers.shape[0])
+    swapped = np.broadcast_to(opponent_grid[None, :, :], (teams.shape[0],) + opponent_grid.shape)
+    swapped = np.where(swapped == teams[:, None, None], teams[None, :, None], swapped)
+
+    own_scores = score_grid[:, None, :]
+    opponent_scores = score_grid[swapped, np.arange(score_grid.shape[1])[None, None, :]]
+
+    return managers, (own_scores > opponent_scores).sum(axis = 2), (own_scores < opponent_scores).sum(axis = 2), (own_scores == opponent_scores).sum(axis = 2)
+
+
+def schedule_swaps(scores_df):
+    """
+    records of every manager under every other manager's regular season schedule, for every season
+    """
+    played = scores_df[(scores_df['outcome'] != 'U') & (scores_df['game_type'] == 'season')]
+
+    swaps = []
+    for year, season_df in played.groupby('year'):
+        managers, wins, losses, ties = season_swaps(season_df)
+        swaps.append(pd.DataFrame({'manager': np.repeat(managers, managers.shape[0]),
+                                   'schedule_of': np.tile(managers, managers.shape[0]),
+                                   'wins': wins.ravel(),
+                                   'losses': losses.ravel(),
+                                   'ties': ties.ravel(),
+                                   'year': year},
+                                  columns = SWAP_COLUMNS))
+
+    if len(swaps) == 0:
+        return pd.DataFrame(columns = SWAP_COLUMNS)
+
+    return pd.concat(swaps).reset_index(drop = True)
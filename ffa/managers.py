@@ -0,0 +1,103 @@
+#%% Modules
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from ffa import warehouse
+
+#%% Parameters
+MANAGER_COLUMNS = ['manager_key', 'owner_id', 'manager', 'first_year']
+
+# owner id -> display name overrides; owners the file gives the same name share one manager key
+NAMES_FILE = Path(os.environ.get('FFA_MANAGER_NAMES', Path(__file__).resolve().parent.parent / '10 Guys 1 Cup Team ID Names.csv'))
+
+# columns of the fact and derived tables that hold manager keys
+KEY_COLUMNS = ['manager', 'opponent', 'schedule_of', 'Manager', 'team_id']
+
+
+#%% Owners
+def owner_id(team):
+    return team.owners[0]['id']
+
+
+def owner_name(team):
+    return (team.owners[0]['firstName'] + ' ' + team.owners[0]['lastName']).title()
+
+
+def read_names_file(path = NAMES_FILE):
+    if not Path(path).exists():
+        return {}
+
+    names = pd.read_csv(path)
+
+    return dict(zip(names['ID'], names['Name']))
+
+
+#%% Manager Dimension
+def load_manager_dim(league_id, root = warehouse.WAREHOUSE_DIR):
+    manager_dim = warehouse.load_table('managers', league_id, root = root)
+    if manager_dim is None:
+        return pd.DataFrame(columns = MANAGER_COLUMNS)
+
+    return manager_dim
+
+
+def update_manager_dim(manager_dim, owners, names_file = NAMES_FILE):
+    """
+    add owners seen in new seasons, given as {owner_id: (latest espn name, first year)}, and refresh display names
+
+    keys never change once given out, so a renamed owner keeps their whole history
+    """
+    names = read_names_file(names_file)
+    manager_dim = manager_dim.loc[:, MANAGER_COLUMNS].copy()
+
+    # a key per display name for owners in the names file, a key per owner id otherwise
+    known = dict(zip(manager_dim['owner_id'], manager_dim['manager_key']))
+    named_keys = {names[owner]: key for owner, key in known.items() if owner in names}
+    next_key = int(manager_dim['manager_key'].max()) + 1 if manager_dim.shape[0] > 0 else 0
+
+    new_rows = []
+    for owner, (espn_name, year) in sorted(owners.items(), key = lambda item: (item[1][1], item[0])):
+        if owner in known:
+            continue
+
+        key = named_keys.get(names.get(owner))
+        if key is None:
+            key = next_key
+            next_key += 1
+            if owner in names:
+                named_keys[names[owner]] = key
+
+        known[owner] = key
+        new_rows.append({'manager_key': key, 'owner_id': owner, 'manager': espn_name, 'first_year': year})
+
+    if len(new_rows) > 0:
+        manager_dim = pd.concat([manager_dim, pd.DataFrame(new_rows, columns = MANAGER_COLUMNS)])
+
+    # the names file wins, otherwise the latest ESPN name
+    latest = {owner: espn_name for owner, (espn_name, _) in owners.items()}
+    manager_dim['manager'] = [names.get(owner, latest.get(owner, name)) for owner, name in zip(manager_dim['owner_id'], manager_dim['manager'])]
+
+    return manager_dim.sort_values(['manager_key', 'owner_id']).reset_index(drop = True)
+
+
+def owner_keys(manager_dim):
+    return pd.Series(manager_dim['manager_key'].to_numpy(), index = manager_dim['owner_id'].to_numpy())
+
+
+def manager_names(manager_dim):
+    """
+    manager key -> display name, one per key
+    """
+    return manager_dim.drop_duplicates('manager_key', keep = 'last').set_index('manager_key')['manager']
+
+
+#%% Rendering
+def with_names(df, manager_dim, columns = KEY_COLUMNS):
+    """
+    a copy of `df` with its manager key columns swapped for display names
+    """
+    names = manager_names(manager_dim)
+
+    return df.assign(**{column: df[column].map(names) for column in columns if column in df.columns})
@@ -0,0 +1,82 @@
+#%% Modules
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+from espn_api.football import constant
+
+from ffa import warehouse
+
+#%% Parameters
+PLAYER_COLUMNS = ['player_id', 'player', 'position', 'year']
+
+# slot id -> position name, and whether the slot is a primary (non-combo) position
+SLOT_IDS = [slot for slot in constant.POSITION_MAP if isinstance(slot, int)]
+SLOT_NAMES = np.full(max(SLOT_IDS) + 1, '', dtype = object)
+PRIMARY_SLOTS = np.zeros(max(SLOT_IDS) + 1, dtype = bool)
+for slot in SLOT_IDS:
+    SLOT_NAMES[slot] = constant.POSITION_MAP[slot]
+    PRIMARY_SLOTS[slot] = slot != 25 and '/' not in constant.POSITION_MAP[slot]
+
+
+#%% Position Resolution
+def slot_matrix(eligible_slots):
+    """
+    pad the per-player eligibleSlots lists into a (players x slots) matrix, -1 where empty
+    """
+    lengths = np.fromiter((len(slots) for slots in eligible_slots), dtype = np.int64, count = len(eligible_slots))
+    matrix = np.full((len(eligible_slots), max(lengths.max(initial = 0), 1)), -1, dtype = np.int64)
+
+    rows = np.repeat(np.arange(len(eligible_slots)), lengths)
+    cols = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    matrix[rows, cols] = np.fromiter(chain.from_iterable(eligible_slots), dtype = np.int64, count = lengths.sum())
+
+    return matrix
+
+
+def resolve_positions(eligible_slots, full_names):
+    """
+    first eligible slot that isnt a combo; defenses (names with a '/') take their first slot
+    """
+    matrix = slot_matrix(eligible_slots)
+    known = (matrix >= 0) & (matrix < len(SLOT_NAMES))
+    safe_matrix = np.where(known, matrix, 0)
+
+    is_defense = np.array(['/' in name for name in full_names], dtype = bool)
+    usable = known & (PRIMARY_SLOTS[safe_matrix] | is_defense[:, None])
+
+    first = usable.argmax(axis = 1)
+    positions = SLOT_NAMES[safe_matrix[np.arange(matrix.shape[0]), first]]
+
+    return np.where(usable.any(axis = 1), positions, None)
+
+
+#%% Player Dimension
+def build_player_dim(pro_players, year):
+    """
+    one row per ESPN player id for a season
+    """
+    pro_players = [player_info for player_info in pro_players if 'eligibleSlots' in player_info.keys()]
+    full_names = [player_info['fullName'] for player_info in pro_players]
+
+    player_dim = pd.DataFrame({'player_id': [player_info['id'] for player_info in pro_players],
+                               'player': full_names,
+                               'position': resolve_positions([player_info['eligibleSlots'] for player_info in pro_players], full_names),
+                               'year': year})
+
+    return player_dim.drop_duplicates('player_id').reset_index(drop = True)
+
+
+def load_player_dim(league_id, root = warehouse.WAREHOUSE_DIR):
+    player_dim = warehouse.load_table('players', league_id, root = root)
+    if player_dim is None:
+        return pd.DataFrame(columns = PLAYER_COLUMNS)
+
+    return player_dim
+
+
+def save_player_dim(player_dim, league_id, years = None, root = warehouse.WAREHOUSE_DIR):
+    # only the given seasons, or those in the frame, are replaced; the other stored seasons stay
+    years = player_dim['year'].unique() if years is None else years
+
+    warehouse.write_table(player_dim, 'players', league_id, root, years = list(years))
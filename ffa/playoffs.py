@@ -0,0 +1,198 @@
+#%% Modules
+import numpy as np
+import pandas as pd
+
+#%% Parameters
+# ESPN's default bracket, for seasons without a stored playoff setting: six playoff teams
+PLAYOFF_TEAMS = 6
+
+# ESPN's playoff seeding tiebreaks: head to head is applied, any other rule (or none stored) breaks ties on points for
+POINTS_TIE_RULE = 'TOTAL_POINTS_SCORED'
+H2H_TIE_RULE = 'H2H_RECORD'
+
+SIMULATIONS = 100_000
+
+# the stored week-by-week history covers every season, so each week gets fewer draws
+WEEKLY_SIMULATIONS = 10_000
+
+# seasons are simulated in chunks to bound memory
+SIM_CHUNK = 25_000
+
+# games of career history a manager's season average is shrunk towards
+PRIOR_GAMES = 4
+
+ODDS_COLUMNS = ['manager', 'playoff', 'bye', 'last_place', 'mean_wins', 'mean_seed', 'year', 'week']
+
+
+#%% Score Distributions
+def score_distributions(scores_df, year, week, managers):
+    """
+    mean and spread of each manager's weekly score, using only games played by `week` of `year`
+
+    the season average is shrunk towards the manager's career average by PRIOR_GAMES games and
+    the spread is the career standard deviation; managers without history get the league's
+    """
+    played = scores_df[(scores_df['outcome'] != 'U') & (scores_df['game_type'] == 'season')]
+    history = played[(played['year'] < year) | ((played['year'] == year) & (played['week'] <= week))]
+    if history.shape[0] < 2:
+        history = played
+
+    career = history.groupby('manager')['points_for'].agg(['mean', 'std']).reindex(managers)
+    season = history[history['year'] == year].groupby('manager')['points_for'].agg(['sum', 'count']).reindex(managers, fill_value = 0)
+
+    career_mean = career['mean'].fillna(history['points_for'].mean()).to_numpy()
+    career_std = career['std'].fillna(history['points_for'].std()).to_numpy()
+    mean = (season['sum'].to_numpy() + PRIOR_GAMES * career_mean) / (season['count'].to_numpy() + PRIOR_GAMES)
+
+    return mean, career_std
+
+
+#%% Bracket
+def playoff_byes(playoff_teams):
+    """
+    first-round byes of a bracket: the top seeds sit out until the field is a power of two
+    """
+    return 2 ** int(np.ceil(np.log2(playoff_teams))) - playoff_teams
+
+
+def season_setting(season_settings_df, year, column, default):
+    """
+    one stored setting of a season, or `default` for seasons (or stores) without it
+    """
+    if column not in season_settings_df.columns:
+        return default
+
+    settings = season_settings_df.loc[season_settings_df['year'] == year, column].dropna()
+
+    return default if settings.shape[0] == 0 else settings.iloc[0]
+
+
+#%% Simulation
+def incidence(teams, home, away):
+    """
+    (games x teams) incidence matrices of the home and away sides, turning per-game results into per-team totals with one matmul
+    """
+    home_matrix = np.zeros((home.shape[0], teams))
+    away_matrix = np.zeros((away.shape[0], teams))
+    home_matrix[np.arange(home.shape[0]), home] = 1
+    away_matrix[np.arange(away.shape[0]), away] = 1
+
+    return home_matrix, away_matrix
+
+
+def head_to_head(sim_wins, results, home, away, home_matrix, away_matrix):
+    """
+    each team's win % in games against teams that finished on the same wins (0.5 without any), per simulation
+    """
+    tied = sim_wins[:, home] == sim_wins[:, away]
+    h2h_wins = (results * tied) @ home_matrix + ((1 - results) * tied) @ away_matrix
+    h2h_games = tied @ (home_matrix + away_matrix)
+
+    return np.divide(h2h_wins, h2h_games, out = np.full_like(h2h_wins, 0.5), where = h2h_games > 0)
+
+
+def simulate_seeds(wins, points_for, home, away, mean, std, simulations = SIMULATIONS, seed = None, tie_rule = POINTS_TIE_RULE, played = None):
+    """
+    final seeds (simulations x teams, 0 = top seed) and wins after playing out the remaining games
+
+    wins count a tie as half a win; seeds are ordered by wins, then under H2H_TIE_RULE by the record in games between
+    teams on the same wins, then total points for. `played` is (home, away, home result) of the games already played
+    """
+    rng = np.random.default_rng(seed)
+    teams = wins.shape[0]
+    home_matrix, away_matrix = incidence(teams, home, away)
+
+    # head to head looks at every game of the season, played or simulated
+    if played is None:
+        played = (np.zeros(0, dtype = np.int64), np.zeros(0, dtype = np.int64), np.zeros(0))
+    season_home, season_away = np.r_[played[0], home], np.r_[played[1], away]
+    season_home_matrix, season_away_matrix = incidence(teams, season_home, season_away)
+
+    seeds = []
+    final_wins = []
+    for start in range(0, simulations, SIM_CHUNK):
+        size = min(SIM_CHUNK, simulations - start)
+        home_scores = rng.normal(mean[home], std[home], size = (size, home.shape[0]))
+        away_scores = rng.normal(mean[away], std[away], size = (size, away.shape[0]))
+
+        home_result = (home_scores > away_scores) + 0.5 * (home_scores == away_scores)
+        sim_wins = wins + home_result @ home_matrix + (1 - home_result) @ away_matrix
+        sim_points = points_for + home_scores @ home_matrix + away_scores @ away_matrix
+
+        # best record first, then the tiebreaks
+        if tie_rule == H2H_TIE_RULE:
+            results = np.concatenate([np.broadcast_to(played[2], (size, played[2].shape[0])), home_result], axis = 1)
+            h2h = head_to_head(sim_wins, results, season_home, season_away, season_home_matrix, season_away_matrix)
+        else:
+            h2h = np.zeros_like(sim_wins)
+        order = np.lexsort((-sim_points, -h2h, -sim_wins), axis = 1)
+        sim_seeds = np.empty_like(order)
+        np.put_along_axis(sim_seeds, order, np.arange(teams)[None, :], axis = 1)
+
+        seeds.append(sim_seeds)
+        final_wins.append(sim_wins)
+
+    return np.concatenate(seeds), np.concatenate(final_wins)
+
+
+def playoff_odds(scores_df, year, week = None, playoff_teams = PLAYOFF_TEAMS, simulations = SIMULATIONS, seed = None, tie_rule = POINTS_TIE_RULE):
+    """
+    playoff, bye and last-place probabilities per manager as of the end of `week` (default: the last played week)
+    """
+    byes = playoff_byes(playoff_teams)
+    season = scores_df[(scores_df['year'] == year) & (scores_df['game_type'] == 'season')]
+    if week is None:
+        week = int(season.loc[season['outcome'] != 'U', 'week'].max()) if (season['outcome'] != 'U').any() else 0
+
+    managers = np.sort(season['manager'].unique())
+    team_index = pd.Series(np.arange(managers.shape[0]), index = managers)
+
+    # standings so far
+    played = season[(season['week'] <= week) & (season['outcome'] != 'U')]
+    played = played.assign(result = played['outcome'].astype(str).map({'W': 1.0, 'T': 0.5, 'L': 0.0}))
+    wins = played.groupby('manager')['result'].sum().reindex(managers, fill_value = 0).to_numpy()
+    played_games = played[played['manager'] < played['opponent']]
+    played_games = (team_index[played_games['manager']].to_numpy(), team_index[played_games['opponent']].to_numpy(),
+                    played_games['result'].to_numpy(dtype = float))
+    points_for = played.groupby('manager')['points_for'].sum().reindex(managers, fill_value = 0).to_numpy()
+
+    # every remaining game appears once per side, keep one row per game
+    remaining = season[(season['week'] > week) & (season['manager'] < season['opponent'])]
+    home = team_index[remaining['manager']].to_numpy()
+    away = team_index[remaining['opponent']].to_numpy()
+
+    mean, std = score_distributions(scores_df, year, week, managers)
+    seeds, sim_wins = simulate_seeds(wins, points_for, home, away, mean, std, simulations, seed, tie_rule, played_games)
+
+    return pd.DataFrame({'manager': managers,
+                         'playoff': (seeds < playoff_teams).mean(axis = 0),
+                         'bye': (seeds < byes).mean(axis = 0),
+                         'last_place': (seeds == managers.shape[0] - 1).mean(axis = 0),
+                         'mean_wins': sim_wins.mean(axis = 0),
+                         'mean_seed': seeds.mean(axis = 0) + 1,
+                         'year': year,
+                         'week': week},
+                        columns = ODDS_COLUMNS)
+
+
+def weekly_playoff_odds(scores_df, season_settings_df, years = None, simulations = WEEKLY_SIMULATIONS, seed = 0):
+    """
+    playoff odds of every season (or only `years`) as they stood after each played regular season week
+
+    a season's odds only look at it and the seasons before, so they never change once it is over
+    """
+    played = scores_df[(scores_df['outcome'] != 'U') & (scores_df['game_type'] == 'season')]
+    if years is not None:
+        played = played[played['year'].isin(years)]
+
+    odds = []
+    for year, weeks in played.groupby('year')['week'].unique().items():
+        playoff_teams = int(season_setting(season_settings_df, year, 'playoff_team_count', PLAYOFF_TEAMS))
+        tie_rule = season_setting(season_settings_df, year, 'playoff_seed_tie_rule', POINTS_TIE_RULE)
+        for week in sorted(weeks):
+            odds.append(playoff_odds(scores_df, year, week, playoff_teams, simulations = simulations, seed = seed, tie_rule = tie_rule))
+
+    if len(odds) == 0:
+        return pd.DataFrame(columns = ODDS_COLUMNS)
+
+    return pd.concat(odds).reset_index(drop = True)
@@ -0,0 +1,77 @@
+#%% Modules
+import pandas as pd
+
+#%% Parameters
+BOOK_COLUMNS = ['board', 'rank', 'manager', 'opponent', 'year', 'points', 'ppg', 'adj_ppg', 'win_pct', 'score', 'mov', 'total']
+
+
+#%% Leaderboard Helpers
+def adjusted_ppg(games):
+    """
+    points per game per manager-season, shifted by how that season scored against the all-time average
+    """
+    ppg = games.groupby(['manager', 'year'], as_index = False)['points_for'].mean().rename(columns = {'points_for': 'ppg'})
+    yearly_ppg = games.groupby('year')['points_for'].mean()
+    ppg['adj_ppg'] = ppg['ppg'] - ppg['year'].map(yearly_ppg) + games['points_for'].mean()
+
+    return ppg
+
+
+def win_pct(games):
+    counts = pd.crosstab([games['manager'], games['year']], games['outcome'])
+    for outcome in ['W', 'L', 'T']:
+        if outcome not in counts.columns:
+            counts[outcome] = 0
+
+    counts['win_pct'] = round((counts['W'] + 0.5 * counts['T']) / (counts['W'] + counts['L'] + counts['T']) * 100, 2)
+
+    return counts.reset_index().loc[:, ['manager', 'year', 'win_pct']]
+
+
+def game_score(games):
+    return games['points_for'].round(2).astype(str) + '-' + games['points_against'].round(2).astype(str)
+
+
+#%% Records Book
+def records_book(scores_df):
+    """
+    every leaderboard on the Records page, selected once per refresh, as one long table keyed by board
+    """
+    played = scores_df[scores_df['outcome'] != 'U']
+    season_records = played[played['game_type'] == 'season']
+    postseason_records = played[played['game_type'] == 'postseason']
+
+    season_ppg = adjusted_ppg(season_records)
+    postseason_ppg = adjusted_ppg(postseason_records)
+    season_win_pct = win_pct(season_records)
+    season_games = season_records.assign(score = game_score(season_records),
+                                         total = season_records['points_for'] + season_records['points_against'])
+
+    boards = {
+        'top_weekly': season_records.nlargest(20, 'points_for'),
+        'top_playoff': postseason_records.nlargest(20, 'points_for'),
+        'top_season_ppg': season_ppg.nlargest(20, 'adj_ppg'),
+        'top_playoff_ppg': postseason_ppg.nlargest(15, 'adj_ppg'),
+        'lowest_weekly': season_records.nsmallest(15, 'points_for'),
+        'worst_season_ppg': season_ppg.nsmallest(15, 'ppg'),
+        'best_win_pct': season_win_pct.nlargest(11, 'win_pct'),
+        'worst_win_pct': season_win_pct.nsmallest(11, 'win_pct'),
+        'largest_mov': season_games.nlargest(11, 'mov'),
+        'highest_scoring': season_games[season_games['outcome'] == 'W'].nlargest(10, 'total'),
+    }
+
+    book = []
+    for board, leaders in boards.items():
+        leaders = leaders.rename(columns = {'points_for': 'points'}).assign(board = board, rank = range(1, leaders.shape[0] + 1))
+        book.append(leaders.reindex(columns = BOOK_COLUMNS))
+
+    return pd.concat(book).reset_index(drop = True)
+
+
+def leaderboard(book, board, columns):
+    """
+    one board of the records book in rank order, with `columns` renamed for display
+    """
+    leaders = book[book['board'] == board].sort_values('rank')
+
+    return leaders.loc[:, list(columns)].rename(columns = columns).reset_index(drop = True)
@@ -0,0 +1,133 @@
+#%% Modules
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+#%% Parameters
+# how much memory the loaded tables may take together before the least recently used are dropped
+MEMORY_BUDGET = int(os.environ.get('FFA_MEMORY_BUDGET_MB', 1024)) * 2 ** 20
+
+
+#%% Read-only Frames
+def freeze(df):
+    """
+    a copy of `df` whose numpy-backed columns cannot be written in place
+
+    the frames are shared by every session, so a page that assigns into one gets an error
+    instead of changing another user's data; arrow strings are immutable already
+    """
+    columns = {}
+    for column in df.columns:
+        values = df[column].array
+        if isinstance(df[column].dtype, np.dtype):
+            values = df[column].to_numpy(copy = True)
+            values.flags.writeable = False
+        columns[column] = values
+
+    return pd.DataFrame(columns, index = df.index, copy = False)
+
+
+def frame_nbytes(df):
+    return int(df.memory_usage(index = True, deep = True).sum())
+
+
+#%% Dataset Registry
+class DatasetRegistry:
+    """
+    one read-only copy of each (league, table) per process, least recently used dropped past the budget
+
+    tables are loaded one at a time as pages ask for them, so memory follows what is actually viewed;
+    each is held with the store version it was read at and reloaded once the store moves on
+    """
+    def __init__(self, budget = MEMORY_BUDGET):
+        self.budget = budget
+        self._tables = OrderedDict()
+        self._nbytes = {}
+        self._versions = {}
+        self._lock = threading.Lock()
+        self._load_locks = {}
+
+    @property
+    def nbytes(self):
+        return sum(self._nbytes.values())
+
+    def leagues(self):
+        return list(dict.fromkeys(league_id for league_id, _ in self._tables))
+
+    def get(self, league_id, name, version = None):
+        """
+        the held table, or None if there is none or it was read at another version
+        """
+        with self._lock:
+            df = self._tables.get((league_id, name))
+            if df is None or self._versions[(league_id, name)] != version:
+                return None
+            self._tables.move_to_end((league_id, name))
+
+            return df
+
+    def put(self, league_id, name, df, version = None):
+        """
+        freeze and hold one table, replacing whatever was held for it before
+        """
+        df = freeze(df)
+
+        with self._lock:
+            self._tables[(league_id, name)] = df
+            self._nbytes[(league_id, name)] = frame_nbytes(df)
+            self._versions[(league_id, name)] = version
+            self._tables.move_to_end((league_id, name))
+
+            # the table just loaded always stays, even if it alone is over budget
+            while len(self._tables) > 1 and self.nbytes > self.budget:
+                self._drop(next(iter(self._tables)))
+
+        return df
+
+    def _drop(self, key):
+        """
+        forget one table and its load lock; called holding self._lock
+        """
+        self._tables.pop(key, None)
+        self._nbytes.pop(key, None)
+        self._versions.pop(key, None)
+
+        # a lock some session is loading under stays, so the sessions waiting on it still share one load
+        load_lock = self._load_locks.get(key)
+        if load_lock is not None and not load_lock.locked():
+            del self._load_locks[key]
+
+    def load(self, league_id, name, loader, version = None):
+        """
+        the held table, or the one `loader()` returns; None if it has nothing
+
+        loads of one table are serialized, so sessions opening it at once read it from disk only once,
+        while other tables and leagues load alongside
+        """
+        df = self.get(league_id, name, version)
+        if df is not None:
+            return df
+
+        with self._lock:
+            load_lock = self._load_locks.setdefault((league_id, name), threading.Lock())
+
+        with load_lock:
+            df = self.get(league_id, name, version)
+            if df is None:
+                df = loader()
+                if df is None:
+                    return None
+                df = self.put(league_id, name, df, version)
+
+        return df
+
+    def discard(self, league_id):
+        """
+        drop every table of a league, e.g. after it was rebuilt
+        """
+        with self._lock:
+            for key in [key for key in dict.fromkeys([*self._tables, *self._load_locks]) if key[0] == league_id]:
+                self._drop(key)
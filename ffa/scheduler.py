@@ -0,0 +1,133 @@
+#%% Modules
+import asyncio
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import requests
+from espn_api.requests.espn_requests import ESPNUnknownError
+
+#%% Parameters
+# requests allowed in flight at once
+MAX_IN_FLIGHT = 8
+
+# token bucket: sustained requests per second and the burst allowed on top of it
+RATE_LIMIT = 10
+BURST = 10
+
+# retry policy for transient failures
+RETRIES = 3
+BACKOFF = 0.5
+TIMEOUT = 30
+
+# errors worth another try; bad credentials or a missing league are not
+RETRYABLE_ERRORS = (requests.RequestException, ESPNUnknownError, asyncio.TimeoutError)
+
+
+#%% Rate Limiting
+class TokenBucket:
+    """
+    refills `rate` tokens per second up to `capacity`; each request spends one token
+
+    thread-safe, so fetch_all calls running at once on different threads (one per season) can share a bucket
+    """
+    def __init__(self, rate = RATE_LIMIT, capacity = BURST):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """
+        spend a token, going into debt if there is none; returns how long to wait until it is covered
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+
+            return max(0.0, -self.tokens / self.rate)
+
+    async def acquire(self):
+        await asyncio.sleep(self.reserve())
+
+
+#%% Scheduler
+async def fetch_one(fetch, args, bucket, semaphore, pool, retries, timeout, backoff):
+    for attempt in range(retries + 1):
+        async with semaphore:
+            await bucket.acquire()
+            try:
+                # a timed-out call keeps its worker thread until the socket timeout ends it, but its result is dropped
+                call = asyncio.get_running_loop().run_in_executor(pool, partial(fetch, *args))
+                return await asyncio.wait_for(call, timeout)
+            except RETRYABLE_ERRORS:
+                if attempt == retries:
+                    raise
+
+        # exponential backoff with jitter, outside the semaphore so others can run
+        await asyncio.sleep(backoff * 2 ** attempt * (1 + random.random()))
+
+
+def shutdown_now(pool):
+    """
+    stop a pool without waiting for calls that timed out; cancel_futures only exists from python 3.9 on
+    """
+    if sys.version_info >= (3, 9):
+        pool.shutdown(wait = False, cancel_futures = True)
+    else:
+        pool.shutdown(wait = False)
+
+
+async def fetch_many(fetch, calls, max_in_flight, rate, burst, retries, timeout, backoff, bucket):
+    bucket = TokenBucket(rate, burst) if bucket is None else bucket
+    semaphore = asyncio.Semaphore(max_in_flight)
+
+    # a dedicated pool, so asyncio.run does not join threads stuck in timed-out calls on its way out;
+    # room for every retry, so abandoned calls never starve the live ones
+    pool = ThreadPoolExecutor(max_workers = max_in_flight * (retries + 1))
+    try:
+        return await asyncio.gather(*[fetch_one(fetch, args, bucket, semaphore, pool, retries, timeout, backoff) for args in calls])
+    finally:
+        shutdown_now(pool)
+
+
+def fetch_all(fetch, calls, max_in_flight = MAX_IN_FLIGHT, rate = RATE_LIMIT, burst = BURST, retries = RETRIES, timeout = TIMEOUT, backoff = BACKOFF,
+              bucket = None):
+    """
+    run fetch(*args) for every args tuple in calls concurrently; results come back in the order of calls
+
+    calls made at the same time from several threads stay under one rate limit when they pass the same `bucket`
+    """
+    calls = list(calls)
+    if len(calls) == 0:
+        return []
+
+    run = partial(asyncio.run, fetch_many(fetch, calls, max_in_flight, rate, burst, retries, timeout, backoff, bucket))
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return run()
+
+    # already inside an event loop (Jupyter, #%% cells): run on a fresh loop in a worker thread
+    runner = ThreadPoolExecutor(max_workers = 1)
+    try:
+        return runner.submit(run).result()
+    finally:
+        shutdown_now(runner)
+
+
+def box_scores(league, week):
+    return league.box_scores(week = week)
+
+
+def fetch_box_scores(league_weeks, **kwargs):
+    """
+    box scores for a list of (league, week) pairs, possibly spanning several seasons, in order
+    """
+    return fetch_all(box_scores, league_weeks, **kwargs)
@@ -0,0 +1,60 @@
+#%% Modules
+import pandas as pd
+
+#%% Parameters
+# one dtype per kind of column, shared by every table and page
+YEAR_DTYPE = 'int16'
+WEEK_DTYPE = 'int8'
+COUNT_DTYPE = 'int16'
+ID_DTYPE = 'int32'
+MANAGER_KEY_DTYPE = 'int16'
+STRING_DTYPE = pd.StringDtype('pyarrow')
+
+# columns with a fixed vocabulary are categoricals, so every table shares the same codes
+OUTCOME_DTYPE = pd.CategoricalDtype(['W', 'L', 'T', 'U'])
+GAME_TYPE_DTYPE = pd.CategoricalDtype(['season', 'postseason'])
+SCORE_TYPE_DTYPE = pd.CategoricalDtype(['original', 'optimal', 'projected'])
+
+# master table -> {column: dtype}, in the order of warehouse.MASTER_TABLES; columns a table does not have are skipped
+TABLE_SCHEMAS = {
+    'scores': {'opponent': MANAGER_KEY_DTYPE, 'outcome': OUTCOME_DTYPE, 'manager': MANAGER_KEY_DTYPE,
+               'game_type': GAME_TYPE_DTYPE, 'week': WEEK_DTYPE, 'year': YEAR_DTYPE},
+    'standings': {'Manager': MANAGER_KEY_DTYPE, 'Result': COUNT_DTYPE, 'Year': YEAR_DTYPE},
+    'acquisitions': {'team_id': MANAGER_KEY_DTYPE, 'pickups': COUNT_DTYPE, 'trades': COUNT_DTYPE,
+                     'faab_used': COUNT_DTYPE, 'year': YEAR_DTYPE},
+    'draft': {'round': COUNT_DTYPE, 'pick': COUNT_DTYPE, 'player': STRING_DTYPE, 'player_id': ID_DTYPE,
+              'manager': MANAGER_KEY_DTYPE, 'year': YEAR_DTYPE, 'player_pos': STRING_DTYPE, 'position': STRING_DTYPE},
+    'comparisons_df': {'optimal_positions': STRING_DTYPE, 'optimal_players': STRING_DTYPE, 'week': WEEK_DTYPE,
+                       'manager': MANAGER_KEY_DTYPE, 'og_lineup_pos': STRING_DTYPE, 'og_lineup_name': STRING_DTYPE,
+                       'year': YEAR_DTYPE},
+    'comparisons_score': {'manager': MANAGER_KEY_DTYPE, 'week': WEEK_DTYPE, 'type': SCORE_TYPE_DTYPE, 'year': YEAR_DTYPE},
+    'player_weeks': {'player_id': ID_DTYPE, 'player': STRING_DTYPE, 'position': STRING_DTYPE, 'slot': STRING_DTYPE,
+                     'week': WEEK_DTYPE, 'matchup_period': WEEK_DTYPE, 'manager': MANAGER_KEY_DTYPE, 'year': YEAR_DTYPE},
+    'roster_slots': {'slot': STRING_DTYPE, 'count': COUNT_DTYPE, 'year': YEAR_DTYPE},
+    'season_settings': {'playoff_team_count': COUNT_DTYPE, 'playoff_seed_tie_rule': STRING_DTYPE, 'year': YEAR_DTYPE},
+    'managers': {'manager_key': MANAGER_KEY_DTYPE, 'owner_id': STRING_DTYPE, 'manager': STRING_DTYPE, 'first_year': YEAR_DTYPE},
+}
+
+# columns added after stores were first written: table -> {column: column older rows are filled from}
+LEGACY_COLUMNS = {
+    'player_weeks': {'matchup_period': 'week'},
+}
+
+
+#%% Applying
+def apply_schema(df, name):
+    """
+    cast a table's columns to the canonical dtypes
+    """
+    schema = TABLE_SCHEMAS.get(name, {})
+
+    # rows from older stores get the closest stand-in until the league is rebuilt with --full
+    for column, source in LEGACY_COLUMNS.get(name, {}).items():
+        if source in df.columns:
+            df = df.assign(**{column: df[column].fillna(df[source]) if column in df.columns else df[source]})
+
+    return df.astype({column: dtype for column, dtype in schema.items() if column in df.columns})
+
+
+def apply_master_schema(master_data):
+    return tuple(apply_schema(df, name) for df, name in zip(master_data, TABLE_SCHEMAS))
@@ -0,0 +1,107 @@
+#%% Modules
+from itertools import chain, combinations_with_replacement, product
+
+import numpy as np
+
+#%% Parameters
+NON_STARTERS = ['BE', 'IR']
+
+
+#%% Lineup Patterns
+def starting_slots(positions):
+    """
+    (slot, count) for every starting slot, in the league's slot order
+    """
+    return [(slot, count) for slot, count in positions.items() if slot not in NON_STARTERS and count != 0]
+
+
+def lineup_patterns(slots, classes):
+    """
+    every distinct number of starters per eligibility class, with one slot assignment that achieves it
+
+    players with the same eligible slots are interchangeable, so a lineup is fully described by how
+    many of each class start; -1 marks a slot no class can fill
+    """
+    choices = []
+    for slot, count in slots:
+        eligible = [c for c, eligible_slots in enumerate(classes) if slot in eligible_slots]
+        choices.append(list(combinations_with_replacement(eligible, count)) if len(eligible) > 0 else [(-1,) * count])
+
+    patterns = {}
+    for assignment in product(*choices):
+        counts = np.bincount([c for c in chain.from_iterable(assignment) if c >= 0], minlength = len(classes))
+        patterns.setdefault(tuple(counts), assignment)
+
+    return np.array(list(patterns.keys()), dtype = np.int64).reshape(len(patterns), len(classes)), list(patterns.values())
+
+
+#%% Solver
+def solve_lineups(positions, lineups):
+    """
+    exact optimal lineups for a batch of team-weeks sharing the same roster settings
+
+    each lineup is a list of players with .name, .points and .eligibleSlots; returns, per lineup,
+    the slot of every starter, the chosen players' names (None for an empty slot) and the optimal score
+
+    an empty slot scores zero, so a player who scored below zero is never started: their slot stays empty
+    unless someone else eligible did better
+    """
+    slots = starting_slots(positions)
+    slot_names = set(slot for slot, _ in slots)
+
+    # players are grouped by the starting slots they can fill
+    player_classes = [[frozenset(player.eligibleSlots) & slot_names for player in lineup] for lineup in lineups]
+    classes = sorted(set(chain.from_iterable(player_classes)) - {frozenset()}, key = sorted)
+    class_index = {eligible_slots: c for c, eligible_slots in enumerate(classes)}
+    patterns, assignments = lineup_patterns(slots, classes)
+
+    # flat (team-week, class, points) arrays for every player who can start somewhere
+    lengths = [len(lineup) for lineup in lineups]
+    team = np.repeat(np.arange(len(lineups)), lengths)
+    cls = np.array([class_index.get(eligible_slots, -1) for eligible_slots in chain.from_iterable(player_classes)], dtype = np.int64)
+    points = np.array([player.points for player in chain.from_iterable(lineups)], dtype = float)
+    names = [player.name for player in chain.from_iterable(lineups)]
+
+    # negative scorers are left out, so a slot's contribution never drops below an empty slot's zero
+    keep = (cls >= 0) & (points >= 0)
+    order = np.flatnonzero(keep)[np.lexsort((-points[keep], cls[keep], team[keep]))]
+
+    # rank of each player inside its (team-week, class), best first
+    group = team[order] * len(classes) + cls[order]
+    group_start = np.r_[0, np.flatnonzero(np.diff(group)) + 1]
+    rank = np.arange(order.shape[0]) - np.repeat(group_start, np.diff(np.r_[group_start, order.shape[0]]))
+
+    # prefix sums of the best k players per (team-week, class); missing players count as empty slots
+    depth = max(int(patterns.max(initial = 0)), 1)
+    top_points = np.zeros((len(lineups), len(classes), depth))
+    used = rank < depth
+    top_points[team[order][used], cls[order][used], rank[used]] = points[order][used]
+    prefix = np.concatenate([np.zeros((len(lineups), len(classes), 1)), np.cumsum(top_points, axis = 2)], axis = 2)
+
+    # score every pattern for every team-week at once and keep the best
+    pattern_scores = prefix[:, np.arange(len(classes))[None, :], patterns].sum(axis = 2)
+    best = pattern_scores.argmax(axis = 1) if len(patterns) > 0 else np.zeros(len(lineups), dtype = np.int64)
+
+    # best-first player names per (team-week, class)
+    ranked_names = {}
+    for i in order:
+        ranked_names.setdefault((team[i], cls[i]), []).append(names[i])
+
+    # fill the slots in league order with each class's best remaining players
+    results = []
+    for b in range(len(lineups)):
+        taken = {}
+        optimal_positions = []
+        optimal_players = []
+        for (slot, _), picks in zip(slots, assignments[best[b]] if len(assignments) > 0 else []):
+            for c in picks:
+                candidates = ranked_names.get((b, c), [])
+                k = taken.get(c, 0)
+                taken[c] = k + 1
+                optimal_positions.append(slot)
+                optimal_players.append(candidates[k] if k < len(candidates) else None)
+
+        optimal_score = float(pattern_scores[b, best[b]]) if len(patterns) > 0 else 0.0
+        results.append((optimal_positions, optimal_players, optimal_score))
+
+    return results
@@ -0,0 +1,202 @@
+#%% Modules
+import time
+
+import pandas as pd
+
+from ffa import allplay
+from ffa import cube
+from ffa import draft_value
+from ffa import ingest
+from ffa import luck
+from ffa import playoffs
+from ffa import records
+from ffa import schema
+from ffa import streaks
+from ffa import warehouse
+from ffa import win_shares
+
+#%% Parameters
+# tables computed from the master data after every ingest: name -> (builder, master tables it takes)
+DERIVED_TABLES = {
+    'all_play': (allplay.all_play_records, ['scores']),
+    'streaks': (streaks.streak_index, ['scores']),
+    'records_book': (records.records_book, ['scores']),
+    'matchup_cube': (cube.matchup_cube, ['scores']),
+    'playoff_odds': (playoffs.weekly_playoff_odds, ['scores', 'season_settings']),
+    'schedule_swaps': (luck.schedule_swaps, ['scores']),
+    'draft_value': (draft_value.draft_value, ['draft', 'player_weeks', 'roster_slots']),
+    'win_shares': (win_shares.win_shares, ['player_weeks', 'scores']),
+}
+
+# derived tables whose seasons only depend on that season and earlier ones; their builders take `years`, so each
+# season is written as it lands and later builds only fill in seasons without rows
+SEASONAL_TABLES = ['playoff_odds']
+
+
+#%% Building
+def update_seasonal_table(stored_df, name, source_dfs, years):
+    """
+    a seasonal table over `years`, reusing the seasons `stored_df` already has and building only the rest
+    """
+    kept_df = stored_df[stored_df['year'].isin(years)]
+    missing = [year for year in years if year not in set(kept_df['year'])]
+    new_df = DERIVED_TABLES[name][0](*source_dfs, years = missing) if len(missing) > 0 else None
+    if new_df is None or new_df.shape[0] == 0:
+        return kept_df.reset_index(drop = True)
+
+    return pd.concat([kept_df, new_df]).sort_values('year', kind = 'stable').reset_index(drop = True)
+
+
+def build_derived_tables(master_data, names = None, stored = None):
+    """
+    compute derived tables from the master data; seasonal ones reuse the seasons in `stored` (name -> table)
+    """
+    tables = dict(zip(warehouse.MASTER_TABLES, master_data))
+    names = list(DERIVED_TABLES) if names is None else names
+    stored = {} if stored is None else stored
+    years = sorted(int(year) for year in tables['scores']['year'].unique())
+
+    derived_tables = {}
+    for name in names:
+        builder, sources = DERIVED_TABLES[name]
+        source_dfs = [tables[source] for source in sources]
+        if stored.get(name) is not None:
+            derived_tables[name] = update_seasonal_table(stored[name], name, source_dfs, years)
+        else:
+            derived_tables[name] = builder(*source_dfs)
+
+    return derived_tables
+
+
+def write_store_manifest(league_id, league_start, master_data, tables, importing = (), root = warehouse.WAREHOUSE_DIR):
+    warehouse.write_manifest(league_id,
+                             {'league_id': league_id,
+                              'league_start': league_start,
+                              'years': sorted(int(year) for year in master_data[0]['year'].unique()),
+                              'importing': [int(year) for year in importing],
+                              'tables': tables,
+                              'built_at': time.strftime('%Y-%m-%d %H:%M:%S')},
+                             root)
+
+
+def stream_store(league_id, league_start, espn_s2, swid, full = False, current_year = ingest.CURRENT_YEAR,
+                 max_workers = ingest.MAX_WORKERS, cache = None, root = warehouse.WAREHOUSE_DIR):
+    """
+    ingest a league into the local store one season at a time, yielding (year, years still importing, master data)
+
+    each season's partitions and a manifest listing only the master tables are written as soon as it lands,
+    so the app can open the seasons that are in while the rest are fetched; finish_store adds the derived tables
+    """
+    # only pull new seasons and weeks when the store already has this league
+    stored_data = None if full else warehouse.load_master_data(league_id, root)
+    years = ingest.refresh_years(stored_data, league_start, current_year)
+
+    landed = ingest.stream_master_data(league_id, league_start, espn_s2, swid, stored_data, current_year, max_workers, cache, root)
+    for count, (year, master_data) in enumerate(landed, start = 1):
+        warehouse.write_master_data(master_data, league_id, root, years = [year])
+        write_seasonal_tables(master_data, year, league_id, root)
+        write_store_manifest(league_id, league_start, master_data, warehouse.MASTER_TABLES, years[count:], root)
+
+        yield year, years[count:], master_data
+
+
+def write_seasonal_tables(master_data, year, league_id, root = warehouse.WAREHOUSE_DIR):
+    """
+    build and write the seasonal tables' rows of one season that just landed
+    """
+    tables = dict(zip(warehouse.MASTER_TABLES, master_data))
+    for name in SEASONAL_TABLES:
+        builder, sources = DERIVED_TABLES[name]
+        warehouse.write_table(builder(*[tables[source] for source in sources], years = [year]), name, league_id, root, years = [year])
+
+
+def finish_store(league_id, league_start, master_data, root = warehouse.WAREHOUSE_DIR):
+    """
+    precompute every derived table of a streamed league and mark its store as built
+
+    seasonal tables were written as their seasons landed, only seasons still missing from them are built here
+    """
+    stored = {name: warehouse.load_table(name, league_id, root = root) for name in SEASONAL_TABLES}
+    derived_tables = build_derived_tables(master_data, stored = stored)
+    for name, df in derived_tables.items():
+        warehouse.write_table(df, name, league_id, root)
+
+    # seasons were written as they landed; a full rebuild with a later start year leaves older ones behind
+    for name, df in zip(warehouse.MASTER_TABLES, master_data):
+        warehouse.prune_table(df, name, league_id, root)
+
+    # the manifest goes last, so a store only counts as built once everything is on disk
+    write_store_manifest(league_id, league_start, master_data, warehouse.MASTER_TABLES + list(DERIVED_TABLES), root = root)
+
+    return derived_tables
+
+
+def build_store(league_id, league_start, espn_s2, swid, full = False, current_year = ingest.CURRENT_YEAR,
+                max_workers = ingest.MAX_WORKERS, cache = None, root = warehouse.WAREHOUSE_DIR, progress = None):
+    """
+    ingest a league and precompute every derived table into the local store
+
+    `progress(year, years still importing)` is called as each season lands. one build per league runs at a time,
+    a second one waits and then refreshes on top of what the first wrote
+    """
+    with warehouse.league_lock(league_id, root):
+        master_data = None
+        for year, importing, master_data in stream_store(league_id, league_start, espn_s2, swid, full, current_year, max_workers, cache, root):
+            if progress is not None:
+                progress(year, importing)
+
+        # nothing new to fetch: the derived tables are rebuilt from the store as it is
+        if master_data is None:
+            master_data = warehouse.load_master_data(league_id, root)
+
+        return master_data, finish_store(league_id, league_start, master_data, root)
+
+
+#%% Loading
+def load_store(league_id, root = warehouse.WAREHOUSE_DIR):
+    """
+    the manifest, master data and derived tables of a prebuilt league, or None if it was never built
+    """
+    manifest = warehouse.read_manifest(league_id, root)
+    if manifest is None:
+        return None
+
+    master_data = warehouse.load_master_data(league_id, root)
+    if master_data is None:
+        return None
+
+    # stores built before a derived table existed, or still importing, get it computed on the fly
+    derived_tables = {name: warehouse.load_table(name, league_id, root = root) if name in manifest['tables'] else None
+                      for name in DERIVED_TABLES}
+    missing = [name for name, df in derived_tables.items() if df is None]
+    derived_tables.update(build_derived_tables(master_data, missing))
+
+    return manifest, master_data, derived_tables
+
+
+def load_store_table(name, league_id, root = warehouse.WAREHOUSE_DIR):
+    """
+    one master or derived table of a prebuilt league, or None if the league was never built or no season with it has landed yet
+    """
+    # stores from before a master table existed have to be rebuilt
+    manifest = warehouse.read_manifest(league_id, root)
+    if manifest is None or any(table not in manifest['tables'] for table in warehouse.MASTER_TABLES):
+        return None
+
+    if name in warehouse.MASTER_TABLES:
+        df = warehouse.load_table(name, league_id, root = root)
+        return None if df is None else schema.apply_schema(df, name)
+
+    # derived tables are only written once every season is in, until then they are built from what has landed;
+    # seasonal ones already have the seasons that landed
+    df = warehouse.load_table(name, league_id, root = root) if name in manifest['tables'] else None
+    if df is None:
+        builder, sources = DERIVED_TABLES[name]
+        source_dfs = [load_store_table(source, league_id, root) for source in sources]
+        if any(source_df is None for source_df in source_dfs):
+            return None
+
+        stored_df = warehouse.load_table(name, league_id, root = root) if name in SEASONAL_TABLES else None
+        df = builder(*source_dfs) if stored_df is None else update_seasonal_table(stored_df, name, source_dfs, manifest['years'])
+
+    return df
@@ -0,0 +1,50 @@
+#%% Modules
+import numpy as np
+import pandas as pd
+
+#%% Parameters
+STREAK_COLUMNS = ['manager', 'outcome', 'length', 'start_year', 'start_week', 'end_year', 'end_week']
+
+
+#%% Streak Index
+def streak_index(scores_df):
+    """
+    run-length encoding of every manager's results, one row per streak
+
+    games are in (year, week) order per manager, so streaks carry across seasons but never
+    across managers
+    """
+    games = scores_df.loc[:, ['manager', 'year', 'week', 'outcome']].sort_values(['manager', 'year', 'week'], kind = 'stable')
+    manager = games['manager'].to_numpy()
+    outcome = games['outcome'].to_numpy()
+
+    # a streak starts at the first game, a new manager, or a change of outcome
+    starts = np.ones(games.shape[0], dtype = bool)
+    starts[1:] = (manager[1:] != manager[:-1]) | (outcome[1:] != outcome[:-1])
+    start_idx = np.flatnonzero(starts)
+    end_idx = np.r_[start_idx[1:], games.shape[0]] - 1
+
+    year = games['year'].to_numpy()
+    week = games['week'].to_numpy()
+
+    return pd.DataFrame({'manager': manager[start_idx],
+                         'outcome': outcome[start_idx],
+                         'length': end_idx - start_idx + 1,
+                         'start_year': year[start_idx],
+                         'start_week': week[start_idx],
+                         'end_year': year[end_idx],
+                         'end_week': week[end_idx]},
+                        columns = STREAK_COLUMNS)
+
+
+def longest_streaks(streak_df, outcome, k = 10, managers = None, years = None):
+    """
+    the k longest streaks of one outcome, optionally for some managers or streaks inside a range of years
+    """
+    streaks = streak_df[streak_df['outcome'] == outcome]
+    if managers is not None:
+        streaks = streaks[streaks['manager'].isin(managers)]
+    if years is not None:
+        streaks = streaks[(streaks['start_year'] >= min(years)) & (streaks['end_year'] <= max(years))]
+
+    return streaks.nlargest(k, 'length')
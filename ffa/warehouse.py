@@ -0,0 +1,188 @@
+#%% Modules
+import json
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from ffa import schema
+
+#%% Parameters
+# where the master tables are written, one parquet file per (table, league, year)
+WAREHOUSE_DIR = Path(os.environ.get('FFA_WAREHOUSE_DIR', '.ffa_warehouse'))
+
+# table names in the order create_master_data returns them
+MASTER_TABLES = ['scores', 'standings', 'acquisitions', 'draft', 'comparisons_df', 'comparisons_score', 'player_weeks', 'roster_slots', 'season_settings', 'managers']
+
+# standings keeps its display column names, streaks are filed under the season they started
+# and managers under the season they joined
+YEAR_COLUMNS = {'standings': 'Year', 'streaks': 'start_year', 'managers': 'first_year'}
+
+
+#%% Writing
+def temp_path(path):
+    """
+    a fresh temp file next to `path`, so concurrent writers of the same file never share one
+    """
+    with tempfile.NamedTemporaryFile(dir = path.parent, prefix = path.name + '.', suffix = '.tmp', delete = False) as f:
+        return Path(f.name)
+
+
+def partition_path(name, league_id, year, root = WAREHOUSE_DIR):
+    return Path(root) / name / f'league_id={league_id}' / f'year={year}' / 'part-0.parquet'
+
+
+def write_table(df, name, league_id, root = WAREHOUSE_DIR, years = None):
+    """
+    write one table as a parquet dataset partitioned by league and year, or only the partitions of `years`
+    """
+    year_col = YEAR_COLUMNS.get(name, 'year')
+    if years is not None:
+        df = df[df[year_col].isin(years)]
+
+    for year, year_df in df.groupby(year_col, sort = True):
+        path = partition_path(name, league_id, int(year), root)
+        path.parent.mkdir(parents = True, exist_ok = True)
+
+        # write then rename so a reader never sees half a partition
+        table = pa.Table.from_pandas(year_df, preserve_index = False)
+        tmp_path = temp_path(path)
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, path)
+
+    prune_table(df, name, league_id, root, years)
+
+
+def prune_table(df, name, league_id, root = WAREHOUSE_DIR, years = None):
+    """
+    drop the partitions of years `df` no longer has (only among `years`, if given), so they are not read back as current
+    """
+    kept = set(int(year) for year in df[YEAR_COLUMNS.get(name, 'year')].unique())
+    for year in table_years(name, league_id, root):
+        if year not in kept and (years is None or year in years):
+            path = partition_path(name, league_id, year, root)
+            path.unlink()
+            if not any(path.parent.iterdir()):
+                path.parent.rmdir()
+
+
+def write_master_data(master_data, league_id, root = WAREHOUSE_DIR, years = None):
+    for name, df in zip(MASTER_TABLES, master_data):
+        # display names can change for managers of any season, so the dimension is always rewritten whole
+        write_table(df, name, league_id, root, None if name == 'managers' else years)
+
+
+#%% Reading
+def table_years(name, league_id, root = WAREHOUSE_DIR):
+    league_dir = Path(root) / name / f'league_id={league_id}'
+    if not league_dir.exists():
+        return []
+
+    return sorted(int(path.name.split('=')[1]) for path in league_dir.glob('year=*') if (path / 'part-0.parquet').exists())
+
+
+def load_table(name, league_id, years = None, root = WAREHOUSE_DIR, columns = None):
+    """
+    memory-map the partitions of one table back into a single DataFrame, optionally only some of its columns
+    """
+    stored_years = table_years(name, league_id, root)
+    if years is not None:
+        stored_years = [year for year in stored_years if year in set(years)]
+    if len(stored_years) == 0:
+        return None
+
+    paths = [partition_path(name, league_id, year, root) for year in stored_years]
+    if columns is None:
+        tables = [pq.read_table(path, memory_map = True) for path in paths]
+    else:
+        # seasons can lack a column, e.g. a stat nobody scored in yet
+        tables = [pq.read_table(path, columns = [column for column in columns if column in pq.read_schema(path).names], memory_map = True)
+                  for path in paths]
+
+    # older seasons can have all-null columns, so let arrow unify the schemas
+    return pa.concat_tables(tables, promote = True).to_pandas()
+
+
+def load_master_data(league_id, root = WAREHOUSE_DIR):
+    """
+    the master frames for a league, or None if any of them has not been written yet
+    """
+    master_data = tuple(load_table(name, league_id, root = root) for name in MASTER_TABLES)
+    if any(df is None for df in master_data):
+        return None
+
+    # stores written before the schema existed come back as int64 and object columns
+    return schema.apply_master_schema(master_data)
+
+
+#%% Manifest
+def manifest_path(league_id, root = WAREHOUSE_DIR):
+    return Path(root) / 'manifest' / f'league_id={league_id}.json'
+
+
+def write_manifest(league_id, manifest, root = WAREHOUSE_DIR):
+    """
+    record how and when a league's store was built, next to its tables
+
+    every write bumps the manifest's version, so readers can tell that new tables or seasons have landed
+    """
+    previous = read_manifest(league_id, root)
+    manifest = dict(manifest, version = (previous or {}).get('version', 0) + 1)
+
+    path = manifest_path(league_id, root)
+    path.parent.mkdir(parents = True, exist_ok = True)
+
+    tmp_path = temp_path(path)
+    tmp_path.write_text(json.dumps(manifest, indent = 2))
+    os.replace(tmp_path, path)
+
+
+def read_manifest(league_id, root = WAREHOUSE_DIR):
+    path = manifest_path(league_id, root)
+    if not path.exists():
+        return None
+
+    return json.loads(path.read_text())
+
+
+def manifest_version(league_id, root = WAREHOUSE_DIR):
+    manifest = read_manifest(league_id, root)
+
+    return None if manifest is None else manifest.get('version', 0)
+
+
+#%% Locking
+# builds of the same league in this process; the lock file below covers other processes where the OS supports it
+_league_locks = {}
+_league_locks_lock = threading.Lock()
+
+
+@contextmanager
+def league_lock(league_id, root = WAREHOUSE_DIR):
+    """
+    hold the build lock of one league, so two imports (two members' cookies, or the app and the nightly cli)
+    never write its store at the same time
+    """
+    with _league_locks_lock:
+        lock = _league_locks.setdefault((str(root), league_id), threading.Lock())
+
+    path = Path(root) / 'locks' / f'league_id={league_id}.lock'
+    path.parent.mkdir(parents = True, exist_ok = True)
+
+    with lock, open(path, 'w') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
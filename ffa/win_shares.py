@@ -0,0 +1,95 @@
+#%% Modules
+import numpy as np
+import pandas as pd
+
+from ffa import schema
+from ffa.solver import NON_STARTERS
+
+#%% Parameters
+WIN_SHARE_COLUMNS = ['year', 'week', 'manager', 'player_id', 'player', 'position', 'points', 'win_share']
+
+# small integer keys; player names ride along as categoricals, which store one code per row
+WIN_SHARE_DTYPES = {'year': schema.YEAR_DTYPE, 'week': schema.WEEK_DTYPE, 'manager': schema.MANAGER_KEY_DTYPE, 'player_id': schema.ID_DTYPE,
+                    'player': 'category', 'position': 'category', 'points': 'float32', 'win_share': 'float32'}
+
+
+#%% Win Shares
+def win_shares(player_weeks_df, scores_df):
+    """
+    share of the winning score put up by every starter in every won matchup, across all seasons
+
+    `week` is the matchup, so a starter's scoring periods in a multi-week playoff round are summed into one row
+    """
+    starters = (player_weeks_df[~player_weeks_df['slot'].isin(NON_STARTERS)]
+                    .groupby(['year', 'matchup_period', 'manager', 'player_id'], as_index = False)
+                    .agg(player = ('player', 'first'), position = ('position', 'first'), points = ('points', 'sum'))
+                    .rename(columns = {'matchup_period': 'week'}))
+    wins = scores_df.loc[scores_df['outcome'] == 'W', ['year', 'week', 'manager', 'points_for']]
+
+    shares = pd.merge(starters, wins, how = 'inner', on = ['year', 'week', 'manager'])
+    shares['win_share'] = np.where(shares['points_for'] > 0, shares['points'] / shares['points_for'], 0)
+
+    return (shares.loc[:, WIN_SHARE_COLUMNS]
+                  .astype(WIN_SHARE_DTYPES)
+                  .sort_values(['year', 'week', 'manager', 'player_id'])
+                  .reset_index(drop = True))
+
+
+#%% Rollups
+def filter_shares(shares, years = None, managers = None):
+    keep = pd.Series(True, index = shares.index)
+    if years is not None:
+        keep &= shares['year'].isin(years)
+    if managers is not None:
+        keep &= shares['manager'].isin(managers)
+
+    return shares[keep]
+
+
+def player_win_shares(shares, years = None, managers = None):
+    """
+    total win shares of every player, most first
+    """
+    shares = filter_shares(shares, years, managers)
+
+    return (shares.groupby('player_id', as_index = False)
+                  .agg(player = ('player', 'first'), position = ('position', 'first'), win_shares = ('win_share', 'sum'), wins = ('week', 'size'))
+                  .sort_values('win_shares', ascending = False)
+                  .reset_index(drop = True))
+
+
+def manager_win_shares(shares, years = None):
+    """
+    each manager's total win shares and the player who carried the most of them
+    """
+    by_player = (filter_shares(shares, years)
+                    .groupby(['manager', 'player_id'], as_index = False)
+                    .agg(player = ('player', 'first'), win_shares = ('win_share', 'sum')))
+
+    top = by_player.sort_values('win_shares', ascending = False).drop_duplicates('manager')
+    totals = by_player.groupby('manager', as_index = False)['win_shares'].sum()
+
+    return (pd.merge(totals, top.loc[:, ['manager', 'player', 'win_shares']], how = 'left', on = 'manager', suffixes = ('', '_top'))
+              .rename(columns = {'player': 'top_player'})
+              .sort_values('win_shares', ascending = False)
+              .reset_index(drop = True))
+
+
+def draft_win_shares(shares, draft_board_df, years = None):
+    """
+    win shares earned by each manager's draft picks that season, for whichever team started them
+    """
+    season_shares = (filter_shares(shares, years)
+                        .groupby(['year', 'player_id'], as_index = False)['win_share']
+                        .sum())
+    drafted = draft_board_df.loc[:, ['year', 'round', 'pick', 'player_id', 'player', 'manager']]
+    if years is not None:
+        drafted = drafted[drafted['year'].isin(years)]
+
+    picks = pd.merge(drafted, season_shares, how = 'left', on = ['year', 'player_id'])
+    picks['win_share'] = picks['win_share'].fillna(0)
+
+    return (picks.groupby('manager', as_index = False)['win_share'].sum()
+                 .rename(columns = {'win_share': 'win_shares'})
+                 .sort_values('win_shares', ascending = False)
+                 .reset_index(drop = True))
@@ -3,101 +3,41 @@ import numpy as np
 import pandas as pd
 import altair as alt
 import streamlit as st
-from streamlit import session_state as ss
+
+from ffa.charts import downsample_games, membership_timeline, win_pct_series
+from ffa.cube import cube_slice, cube_totals
+from ffa.datasets import import_notice, league_table, league_version
+from ffa.managers import with_names
 
 # Bring in the data
-scores_df = ss['data']
-standings_df = ss['all_standings']
+manager_dim = league_table('managers')
+scores_key_df = league_table('scores')
+scores_df = with_names(scores_key_df, manager_dim)
+standings_df = with_names(league_table('standings'), manager_dim)
+cube = with_names(league_table('matchup_cube'), manager_dim)
 
 # All Time
 st.header('All Time')
+import_notice()
 
 
 # ------------- #
 # Combination, Interactive Plot
-tab1, tab2 = st.tabs(['Win %', 'Final Placing'])
-
-
-# ------------- #
-# Panel 1: All Time Win Percentage
-with tab1:
-
-    playoff = st.checkbox('Include Playoffs?')
-    if playoff:
-        games = ['season', 'postseason']
-    else:
-        games = ['season']
-
-    # ------------- #
-    # Plot 1.1 Data Manipulation
-    rolling_tally = (scores_df[(scores_df['game_type'].isin(games)) & 
-                               (scores_df['outcome'] != 'U')]
-                        .groupby(['manager', 'year', 'week', 'outcome'])['opponent']
-                        .count()
-                        .reset_index()
-                        .pivot_table(index = ['manager', 'year', 'week'],
-                                     columns = 'outcome',
-                                     values = 'opponent',
-                                     fill_value = 0)
-                        .reset_index()
-                        .rename_axis(None, axis = 1))
-    if 'T' not in rolling_tally.columns:
-        rolling_tally['T'] = 0
-
-    # rolling counts of W, L T
-    rolling_counts = pd.concat([rolling_tally.drop('year', axis = 1).groupby('manager').cumsum(),
-                                rolling_tally[['year']]],
-                               axis = 1)
-    # rolling_counts = rolling_tally.groupby('manager').cumsum()
-    # rolling_counts = rolling_tally.drop('year', axis = 1).groupby('manager').cumsum()
-    rolling_df = pd.merge(rolling_tally.loc[:, ['manager', 'year', 'week']],
-                          rolling_counts.loc[:, ['W', 'L', 'T']],
-                          left_index = True,
-                          right_index = True)
-
-    # create metrics
-    rolling_df['game_id'] = rolling_df['year'].astype(str) + '-' + rolling_df['week'].astype(str)
-    rolling_df['win_pct'] = (rolling_df['W'] + 0.5 * rolling_df['T']) / (rolling_df['W'] + rolling_df['L'] + rolling_df['T'])
-    rolling_df['year_end'] = rolling_df['year'].astype(int) + 1
+# the win % chart only changes when new games land, so its spec is built once per store version;
+# it is drawn over a capped number of games, so its size stays flat as the league's history grows
+@st.cache_data(max_entries = 32, show_spinner = False)
+def win_pct_spec(version, game_types, _scores_df, _manager_dim):
+    rolling_df = with_names(downsample_games(win_pct_series(_scores_df, game_types)), _manager_dim)
     game_id_sort = rolling_df['game_id'].unique()
-
-    # ------------- #
-    # Plot 1.2 Data Manipulation
-    membership_df = scores_df.groupby('manager')[['year']].agg(['min', 'max'])
-    membership_df.columns = ['_'.join(col).strip() for col in membership_df.columns.values]
-    membership_df.reset_index(inplace = True)
-    membership_df['year_max'] = membership_df['year_max'].astype(int) + 1
-
-    league_start = membership_df['year_min'].min()
-    continuation = membership_df['year_max'].max() + 1
-
-    (membership_df.sort_values(['year_min', 'year_max'],
-                               ascending = [True, False],
-                               inplace = True))
-    domain = membership_df.year_min.unique()
-
-
-    # ------------- #
-    # Plot 1.1
-    # Brush highlights, click allows click
-    brush = alt.selection_interval(encodings = ['x'])
-    click = alt.selection_multi(encodings = ['color'])
+    membership_sort = with_names(membership_timeline(_scores_df), _manager_dim)
 
     # interactive module
     click = alt.selection_multi(encodings = ['color'])
 
-    # Manual sort order
-    membership_sort = rolling_df.groupby('manager')[['year']].agg(['min', 'max'])
-    membership_sort.columns = ['_'.join(col).strip() for col in membership_sort.columns.values]
-    membership_sort.reset_index(inplace = True)
-    (membership_sort.sort_values(['year_min', 'year_max'],
-                               ascending = [True, False],
-                               inplace = True))
-
     # Time Series Plot
     win_pct_chart = (
         alt.Chart(
-            rolling_df,
+            rolling_df.loc[:, ['manager', 'game_id', 'win_pct']],
             title = 'Win % Time Series'
         ).mark_line().encode(
             x = alt.X(
@@ -118,11 +58,10 @@ with tab1:
         ).properties(width = 1000)
     )
 
-    # ------------- #
-    # Plot 1.2
+    # membership timeline, one pre-aggregated bar per manager
     timeline_chart = (
         alt.Chart(
-            rolling_df,
+            membership_sort,
             title = 'League Membership Timeline'
         ).mark_bar().encode(
             y = alt.Y(
@@ -131,14 +70,14 @@ with tab1:
                 sort = membership_sort['manager'].to_numpy()
             ),
             x = alt.X(
-                'min(year):O',
+                'year_min:O',
                 title = 'Year',
                 scale = alt.Scale(
-                    domain = np.arange(membership_sort['year_min'].astype(int).min(),
-                                       membership_sort['year_max'].astype(int).max() + 2)
+                    domain = np.arange(membership_sort['year_min'].min(),
+                                       membership_sort['year_max'].max() + 2)
                 )
             ),
-            x2 = ('max(year_end):O'),
+            x2 = ('year_end:O'),
             color = alt.condition(
                 click,
                 'manager:N',
@@ -147,8 +86,27 @@ with tab1:
         ).add_selection(click).properties(width = 1000)
     )
 
-    combo_plot = alt.vconcat(win_pct_chart, timeline_chart)
-    st.altair_chart(combo_plot)
+    with alt.data_transformers.enable('default', max_rows = None):
+        return alt.vconcat(win_pct_chart, timeline_chart).to_dict()
+
+membership_sort = with_names(membership_timeline(scores_key_df), manager_dim)
+tab1, tab2 = st.tabs(['Win %', 'Final Placing'])
+
+
+# ------------- #
+# Panel 1: All Time Win Percentage
+with tab1:
+
+    playoff = st.checkbox('Include Playoffs?')
+    if playoff:
+        games = ['season', 'postseason']
+    else:
+        games = ['season']
+
+    # ------------- #
+    # Plot 1.1 and 1.2
+    combo_plot = win_pct_spec(league_version(), games, scores_key_df, manager_dim)
+    st.vega_lite_chart(combo_plot)
 
 
 # ------------- #
@@ -206,8 +164,8 @@ timeline_chart2 = (
             'min(Year):O',
             title = 'Year',
             scale = alt.Scale(
-                domain = np.arange(membership_sort['year_min'].astype(int).min(),
-                                   membership_sort['year_max'].astype(int).max() + 2)
+                domain = np.arange(membership_sort['year_min'].min(),
+                                   membership_sort['year_max'].max() + 2)
             )
         ),
         x2 = 'max(year_end):O',
@@ -227,53 +185,22 @@ with tab2:
 
 # ------------- #
 ## Filters, etc. for Display
-all_time_record = (scores_df[(scores_df['outcome'] != 'U') & 
-                             (scores_df['game_type'].isin(['season', 'postseason']))]
-                   .groupby(['manager', 'outcome'])[['points_for', 'points_against']]
-                   .agg({'points_for': ['sum', 'count'], 'points_against': 'sum'})
-                   .reset_index())
-all_time_record_szn = (scores_df[(scores_df['outcome'] != 'U') & 
-                                 (scores_df['game_type'].isin(['season']))]
-                        .groupby(['manager', 'outcome'])[['points_for', 'points_against']]
-                        .agg({'points_for': ['sum', 'count'], 'points_against': 'sum'})
-                        .reset_index())
-all_time_record_pzn = (scores_df[(scores_df['outcome'] != 'U') & 
-                                 (scores_df['game_type'].isin(['postseason']))]
-                        .groupby(['manager', 'outcome'])[['points_for', 'points_against']]
-                        .agg({'points_for': ['sum', 'count'], 'points_against': 'sum'})
-                        .reset_index())
-
-def fix_all_time(df):
-    df.columns = ['manager', 'outcome', 'points_for', 'count', 'points_against']
-    df = df.pivot_table(index = 'manager',
-                        columns = 'outcome',
-                        values = ['points_for', 'count'],
-                        fill_value = 0)
-    df.columns = [''.join(col).strip() for col in df.columns.values]
-
-    # check for ties
-    if 'countT' not in df.columns:
-        df['countT'] = 0
-    if 'points_forT' not in df.columns:
-        df['points_forT'] = 0
-
-    # create metrics of interest
-    df['total_points'] = df['points_forW'] + df['points_forT'] + df['points_forL']
-    df['record'] = df['countW'].astype(str) + '-' + df['countL'].astype(str) + '-' + df['countT'].astype(str)
-    df['win_pct'] = round(((df['countW'] + 0.5 * df['countT']) / (df['countW'] + df['countL'] + df['countT'])) * 100, 2)
+def fix_all_time(game_types):
+    # every table is a roll-up of the matchup cube
+    df = cube_totals(cube_slice(cube, game_types = game_types), 'manager')
 
     # clean up dataframe
-    df = (df.loc[:, ['record', 'win_pct', 'total_points']]
+    df = (df.loc[:, ['manager', 'record', 'win_pct', 'points_for']]
             .sort_values('win_pct', ascending = False)
-            .reset_index())
+            .reset_index(drop = True))
 
     df.columns = ['Manager', 'Record', 'Win %', 'Total Points']
     
     return df
 
-atr = fix_all_time(all_time_record)
-atr_s = fix_all_time(all_time_record_szn)
-atr_p = fix_all_time(all_time_record_pzn)
+atr = fix_all_time(['season', 'postseason'])
+atr_s = fix_all_time(['season'])
+atr_p = fix_all_time(['postseason'])
 
 # Display all the data
 align = st.checkbox('Align data?')
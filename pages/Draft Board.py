@@ -6,11 +6,23 @@ import altair as alt
 import streamlit as st
 from streamlit import session_state as ss
 
+from ffa.datasets import import_notice, league_table, league_years
+from ffa.draft_value import DRAFT_VALUE_COLUMNS
+from ffa.managers import with_names
+from ffa.win_shares import draft_win_shares
+
 # All Time
 st.header('Draft Board')
 
 # Bring in the data
-draft_board_df = ss['draft']
+import_notice()
+manager_dim = league_table('managers')
+draft_board_df = with_names(league_table('draft'), manager_dim)
+# seasons before box scores have no values, so the table is empty until one of those is in
+draft_value_df = league_table('draft_value', required = False)
+if draft_value_df is None:
+    draft_value_df = pd.DataFrame(columns = DRAFT_VALUE_COLUMNS)
+draft_value_df = with_names(draft_value_df, manager_dim)
 league_start = ss['start_year']
 current_year = datetime.date.today().year
 
@@ -20,14 +32,25 @@ index_2018 = np.where(all_years == 2018)
 if index_2018[0].shape[0] == 1:
     all_years = np.delete(all_years, index_2018)
 
+# only the seasons that are in, while an import is still running
+all_years = league_years(all_years)
+
 season_of_interest = st.selectbox(
     'Season',
     all_years
 )
+color_by = st.radio('Color picks by', ['Position', 'Value'], horizontal = True)
 
 
 #%% Data Processing
 draft_board_year = draft_board_df[draft_board_df['year'] == season_of_interest]
+
+# points above replacement are precomputed on refresh; only seasons with box scores have them
+value_year = draft_value_df[draft_value_df['year'] == season_of_interest].loc[:, ['round', 'pick', 'points', 'replacement', 'vorp']]
+draft_board_year = pd.merge(draft_board_year, value_year, how = 'left', on = ['round', 'pick'])
+if color_by == 'Value' and value_year.shape[0] == 0:
+    st.write('No box scores are available for this season, so picks are colored by position.')
+    color_by = 'Position'
 draft_order = draft_board_year[draft_board_year['round'] == 1]['manager'].to_list()
 num_teams = len(draft_order)
 num_rounds = draft_board_year['round'].max()
@@ -62,11 +85,20 @@ base = alt.Chart(
     height = num_rounds * 50,
     width = max_characters * num_teams * 6
 )
-heatmap = base.mark_rect().encode(
-    alt.Color(
+if color_by == 'Value':
+    pick_color = alt.Color(
+        'vorp:Q',
+        title = 'Points Above Replacement'
+    ).scale(scheme = 'redyellowgreen', domainMid = 0)
+else:
+    pick_color = alt.Color(
         'position:N',
         legend = None
     ).scale(domain = color_domain, range = color_range)
+
+heatmap = base.mark_rect().encode(
+    pick_color,
+    tooltip = ['player', 'position', 'points', 'replacement', 'vorp']
 ).interactive()
 text = base.mark_text(
 ).encode(
@@ -79,3 +111,16 @@ draft_chart = alt.layer(heatmap, text)
 st.altair_chart(draft_chart, theme = None)
 # st.altair_chart(draft_chart, use_container_width = True)
 
+
+
+#%% Win Shares
+# share of each winning score put up by a manager's draft picks, from the precomputed win shares table
+st.subheader('Draft Win Shares')
+shares_df = league_table('win_shares', required = False)
+season_shares = None if shares_df is None else with_names(draft_win_shares(shares_df, league_table('draft'), years = [season_of_interest]), manager_dim)
+if season_shares is None or season_shares['win_shares'].sum() == 0:
+    st.write('No box scores are available for this season.')
+else:
+    st.dataframe(season_shares.rename(columns = {'manager': 'Manager', 'win_shares': 'Win Shares'}),
+                 hide_index = True,
+                 height = len(season_shares) * 35 + 38)
@@ -2,31 +2,37 @@
 import pandas as pd
 import altair as alt
 import streamlit as st
-from streamlit import session_state as ss
+
+from ffa.cube import cube_slice, cube_totals
+from ffa.datasets import import_notice, league_table
+from ffa.managers import with_names
 
 # Head to Head
 st.header('Head to Head Matchups')
 
 # Bring in the data
-scores_df = ss['data']
+import_notice()
+manager_dim = league_table('managers')
+cube = with_names(league_table('matchup_cube'), manager_dim)
 
 # Parameters for the matchup
 man1, man2, man3 = st.columns(3)
 with man1:
     manager1 = st.multiselect(
         'Manager(s) #1',
-        scores_df['manager'].unique()
+        cube['manager'].unique()
     )
 with man2:
     manager2 = st.multiselect(
         'Manager(s) #2',
-        scores_df['opponent'].unique()
+        cube['opponent'].unique()
     )
 with man3:
+    game_types = cube['game_type'].unique().tolist()
     game_filter = st.multiselect(
         'Game Type',
-        scores_df['game_type'].unique(),
-        scores_df['game_type'].unique()
+        game_types,
+        game_types
     )
 
 # Apply coloring
@@ -35,77 +41,64 @@ def highlight_wins(value):
     return f'background-color: {color}'
 
 ## Create the DataFrame to be output: H2H
-# Look at the Table
-filtered_scores = (scores_df[(scores_df['manager'].isin(manager1)) & 
-                             (scores_df['opponent'].isin(manager2)) & 
-                             (scores_df['outcome'] != 'U') & 
-                             (scores_df['game_type'].isin(game_filter))]
-                    .reset_index(drop = True)
-                    .iloc[:, [6, 4, 0, 1, 2, 8, 7, 5]])
-filtered_scores.columns = ['Week', 'Manager(s) #1', 'Manager(s) #2',
-                           'Outcome', 'Points For', 'Points Against',
-                           'Year', 'Game Type']
-filtered_scores['Year'] = filtered_scores['Year'].astype(str)
+# records and points are sums over the matchup cube, whatever is selected; the cube only holds played games
+matchups = cube_slice(cube, managers = manager1, opponents = manager2, game_types = game_filter)
+totals = cube_totals(matchups.assign(selection = 'all'), 'selection')
 
-## Create the H2H Record
-# Create Record
-winloss = filtered_scores['Outcome'].value_counts()
-if 'W' in winloss.index:
-    wins = winloss[winloss.index == 'W'].values[0]
-else:
-    wins = 0
-if 'L' in winloss.index:
-    loss = winloss[winloss.index == 'L'].values[0]
-else:
-    loss = 0
-if 'T' in winloss.index:
-    ties = winloss[winloss.index == 'T'].values[0]
-else:
-    ties = 0
+# years are stored as integers; show them without a thousands separator
+year_format = {'Year': st.column_config.NumberColumn(format = '%d')}
 
-record = str(wins) + '-' + str(loss) + '-' + str(ties)
+## Create the H2H Record
+record = totals['record'].iloc[0] if totals.shape[0] > 0 else '0-0-0'
 
 ## Create the Aggregate H2H Score
-filtered_pf = filtered_scores['Points For'].sum()
-filtered_pa = filtered_scores['Points Against'].sum()
+filtered_pf = round(matchups['points_for'].sum(), 2)
+filtered_pa = round(matchups['points_against'].sum(), 2)
 
 # Output the values
-if filtered_scores.shape[0] == 0:
+if matchups.shape[0] == 0:
     st.write('No data matching selected parameters.')
 else:
     p1, p2, p3 = st.columns(3)
     with p1:
         st.subheader('Record: ' + record, divider = 'red')
     with p2:
-        st.subheader('Total Points: ' + filtered_pf.astype(str) + '-' + filtered_pa.astype(str), divider = 'red')
+        st.subheader('Total Points: ' + str(filtered_pf) + '-' + str(filtered_pa), divider = 'red')
 
-    # Checkbox to show all data
+    # the game-by-game list is the only part that needs the scores, so they are only loaded when it is asked for
     show_all = st.checkbox('Show all matchups')
     if show_all:
-        st.dataframe(filtered_scores.style.applymap(highlight_wins, subset = ['Outcome']), hide_index = True, height = len(filtered_scores) * 35 + 38)
-    else:
-        st.dataframe(filtered_scores.style.applymap(highlight_wins, subset = ['Outcome']), hide_index = True)
+        scores_df = with_names(league_table('scores'), manager_dim)
+        filtered_scores = (scores_df[(scores_df['manager'].isin(manager1)) &
+                                     (scores_df['opponent'].isin(manager2)) &
+                                     (scores_df['outcome'] != 'U') &
+                                     (scores_df['game_type'].isin(game_filter))]
+                            .reset_index(drop = True)
+                            .loc[:, ['week', 'manager', 'opponent', 'outcome', 'points_for', 'points_against', 'year', 'game_type']])
+        filtered_scores.columns = ['Week', 'Manager(s) #1', 'Manager(s) #2',
+                                   'Outcome', 'Points For', 'Points Against',
+                                   'Year', 'Game Type']
+
+        st.dataframe(filtered_scores.style.applymap(highlight_wins, subset = ['Outcome']), hide_index = True, height = len(filtered_scores) * 35 + 38, column_config = year_format)
 
 
 
 ## Create the Wins/Points Charts
-# subset before column fixes to create a plotting dataframe
-plot_df_wins = (filtered_scores.loc[:, ['Year', 'Outcome', 'Manager(s) #2']]
-                               .groupby(['Year', 'Outcome'], as_index = False)
-                               .count()
-                               .rename(columns = {'Manager(s) #2': 'counts'}))
-plot_df_wins['cum_count'] = plot_df_wins.groupby('Outcome')['counts'].cumsum()
-plot_df_wins['Outcome'] = plot_df_wins['Outcome'].replace(['W', 'L'], ['Wins', 'Losses'])
+# the same cube slice, rolled up by year
+plot_df_years = matchups.groupby('year', as_index = False)[['wins', 'losses', 'points_for', 'points_against']].sum()
+plot_df_years = plot_df_years.rename(columns = {'year': 'Year'})
+plot_df_years[['cum_wins', 'cum_losses', 'cum_pf', 'cum_pa']] = plot_df_years[['wins', 'losses', 'points_for', 'points_against']].cumsum()
+
+plot_df_wins = (pd.melt(plot_df_years,
+                        id_vars = ['Year'],
+                        value_vars = ['cum_wins', 'cum_losses'],
+                        var_name = 'Outcome',
+                        value_name = 'cum_count'))
+plot_df_wins['Outcome'] = plot_df_wins['Outcome'].replace(['cum_wins', 'cum_losses'], ['Wins', 'Losses'])
 
 
 # plot dataframe for total points for/against
-plot_df_points = (filtered_scores.loc[:, ['Year', 'Points For', 'Points Against']]
-                                 .groupby('Year', as_index = False)
-                                 .sum())
-plot_df_points['cum_pf'] = plot_df_points['Points For'].cumsum()
-plot_df_points['cum_pa'] = plot_df_points['Points Against'].cumsum()
-plot_df_points['Year'] = plot_df_points['Year'].astype(str)
-plot_df_points = pd.melt(plot_df_points,
+plot_df_points = pd.melt(plot_df_years,
                          id_vars = ['Year'],
                          value_vars = ['cum_pf', 'cum_pa'])
 plot_df_points['variable'] = plot_df_points['variable'].replace(['cum_pf', 'cum_pa'], ['For', 'Against'])
@@ -119,7 +112,7 @@ range = ["green", "red"]
 
 wins_chart = alt.Chart(plot_df_wins,
                        title = 'Win/Loss Time Series').mark_line().encode(
-    x = alt.X('Year').title('Year'),
+    x = alt.X('Year:O').title('Year'),
     y = alt.Y('cum_count').title('Count'),
     color = alt.Color('Outcome').scale(domain = domain, range = range).title('Outcome')
 ).interactive()
@@ -127,7 +120,7 @@ wins_chart = alt.Chart(plot_df_wins,
 ## Line Chart of Points For/Against
 points_chart = alt.Chart(plot_df_points,
                          title = 'Points For/Against Time Series').mark_line().encode(
-                             x = alt.X('Year').title('Year'),
+                             x = alt.X('Year:O').title('Year'),
                              y = alt.Y('value').title('Points'),
                              color = alt.Color('variable').scale(domain = domain2, range = range).title('Points')
                          ).interactive()
@@ -6,15 +6,21 @@ import altair as alt
 import streamlit as st
 from streamlit import session_state as ss
 
+from ffa.datasets import import_notice, league_table, league_years
+from ffa.managers import with_names
+
 #%% Season-Level
 st.header('Season-Level League Data')
 
 # Bring in the data
-scores_df = ss['data']
+import_notice()
+manager_dim = league_table('managers')
+scores_df = with_names(league_table('scores'), manager_dim)
 league_start = ss['start_year']
-standings_df = ss['all_standings']
-all_comps_df = ss['comparisons_df']
-all_scores_df = ss['comparisons_score']
+standings_df = with_names(league_table('standings'), manager_dim)
+all_play_df = with_names(league_table('all_play'), manager_dim)
+playoff_odds_df = with_names(league_table('playoff_odds'), manager_dim)
+schedule_swaps_df = with_names(league_table('schedule_swaps'), manager_dim)
 current_year = datetime.date.today().year
 
 # remove 2018 as its a problem (TO FIX)
@@ -23,81 +29,21 @@ index_2018 = np.where(all_years == 2018)
 if index_2018[0].shape[0] == 1:
     all_years = np.delete(all_years, index_2018)
 
+# only the seasons that are in, while an import is still running
+all_years = league_years(all_years)
+
 season_of_interest = st.selectbox(
     'Season',
     all_years
 )
 
 #%% Heatmap Plot: Dataframe
-scores_df['year'] = scores_df['year'].astype(int)
 df_source = scores_df[(scores_df['outcome'] != 'U') & (scores_df['game_type'] == 'season') & (scores_df['year'] == season_of_interest)]
 
 num_weeks = df_source['week'].max()
 
-# Create the dataframe
-def weekly_aggregate(i):
-    """
-    subset all scores by a given week then add record, wins, scores
-    """
-    # all the scores for the week, sorted, and adding columns for the w/l/t
-    total_teams = df_source.manager.nunique()
-    scores = (df_source[df_source['week'] == (i + 1)]
-                .sort_values(by = ['points_for'])
-                .reset_index(drop = True)
-                .assign(total_wins = np.arange(0, total_teams, 1),
-                        total_loss = np.arange(total_teams - 1, -1, -1),
-                        ind = np.arange(0, total_teams, 1)))
-    
-    #which values have matching scores?
-    ties_loc = np.argwhere(np.array(scores.duplicated(subset = 'points_for',
-                                                      keep = False)) == True)
-    
-    #split the duplicated and non-duplicated values into separate DFs
-    scores_nod = (scores[~scores['total_wins'].isin(ties_loc.flatten())]
-                    .assign(total_ties = 0))
-    scores_dup = scores[scores['total_wins'].isin(ties_loc.flatten())]
-    
-    #what are the unique scores in the list of duplicates?
-    unique_scores = scores_dup['points_for'].unique()
-    
-    #only run through the loop if there are duplicates
-    if len(unique_scores) > 0:
-        #loop through all the scores to add the ties
-        #initiate list
-        dup_list = []
-        for j in range(len(unique_scores)):
-            
-            #iterating through all the repeated scores
-            unique = scores[scores['points_for'] == unique_scores[j]]
-            
-            #add in loss/wins
-            unique['total_wins'] = min(unique['total_wins'])
-            unique['total_loss'] = min(unique['total_loss'])
-            unique = unique.assign(total_ties = total_teams - 1
-                                   - (unique['total_loss'] + unique['total_wins']))
-            
-            dup_list.append(unique)
-            
-        #compile them
-        dup_list = pd.concat(dup_list)
-        dup_list = pd.concat([dup_list, scores_nod]).sort_values(by = ["ind"])
-        return dup_list
-    
-    else:
-        scores["total_ties"] = 0
-        return scores
-
-
-# initialize an empty dataframe to append to
-full_wl = []
-
-# loop through all the teams and have the rows append
-for j in range(df_source['week'].max()):
-    row = weekly_aggregate(j)
-    full_wl.append(row)
-
-# remove the first row which was just empty
-full_wl = pd.concat(full_wl)
+# all-play records are precomputed for every season; just pick this one out
+full_wl = all_play_df[all_play_df['year'] == season_of_interest]
 
 # Make the Plot
 base = alt.Chart(
@@ -136,13 +82,14 @@ simulated_record['simulated_record'] = simulated_record['total_wins'].astype(str
 simulated_record['s_standing'] = np.arange(simulated_record.shape[0]) + 1
 
 # EDIT: to create totalpoints then sort by wins then points, add ties
-espn_record = (df_source.groupby(['manager', 'outcome'])['points_for']
+espn_record = (df_source.groupby(['manager', 'outcome'], observed = True)['points_for']
                         .agg(['sum', 'count'])
                         .reset_index()
                         .pivot_table(index = 'manager',
                                      columns = 'outcome',
                                      values = ['sum', 'count'],
-                                     fill_value = 0))
+                                     fill_value = 0,
+                                     observed = True))
 espn_record.columns = [''.join(col).strip() for col in espn_record.columns.values]
 espn_record = (espn_record.sort_values(by = ['countW', 'sumW'], ascending = False)
                           .drop(['sumL', 'sumW'], axis = 1))
@@ -179,7 +126,6 @@ def highlight_wins(value):
 
 #%% Results of the Season
 standings_year = standings_df[standings_df['Year'] == season_of_interest]
-standings_year['Year'] = standings_year['Year'].astype(str)
 # standings_year.drop('year_end', axis = 1, inplace = True)
 # standings_year['year_end'] = standings_year['year_end'].astype(str)
 
@@ -193,7 +139,62 @@ with frame1:
     st.markdown(r'$$Wins=\frac{PF^{6.2}}{PF^{6.2}+PA^{6.2}} \times \# games$$')
 with frame2:
     st.subheader('Season Results')
-    st.dataframe(standings_year, hide_index = True, height = len(standings_year) * 35 + 38)
+    st.dataframe(standings_year, hide_index = True, height = len(standings_year) * 35 + 38,
+                 column_config = {'Year': st.column_config.NumberColumn(format = '%d')})
+
+st.divider()
+
+
+#%% Schedule Luck
+# every manager's scores against every other manager's schedule, precomputed on refresh
+swaps_year = schedule_swaps_df[schedule_swaps_df['year'] == season_of_interest]
+swap_base = alt.Chart(
+    swaps_year,
+    title = 'Wins With Swapped Schedules'
+).encode(
+    alt.X('schedule_of:O', axis = alt.Axis(labelAngle = -45)).title("Schedule Of"),
+    alt.Y('manager:O').title('Manager')
+)
+swap_heatmap = swap_base.mark_rect().encode(
+    alt.Color(
+        'wins:Q',
+        legend = None
+    ).scale(
+        scheme = 'redyellowgreen'
+    ),
+    tooltip = ['manager', 'schedule_of', 'wins', 'losses', 'ties']
+)
+swap_text = swap_base.mark_text(
+    baseline = 'middle',
+    fontWeight = 'bold'
+).encode(
+    alt.Text(
+        'wins:Q'
+    )
+)
+
+swap_chart = alt.layer(swap_heatmap, swap_text).configure_scale(rectBandPaddingInner = 0.1)
+st.altair_chart(swap_chart, use_container_width = True)
+st.write('The diagonal is the actual record; reading across a row shows how that manager would have fared with each schedule.')
+
+st.divider()
+
+
+#%% Playoff Odds
+# simulated after every week of the season, precomputed on refresh
+odds_year = playoff_odds_df[playoff_odds_df['year'] == season_of_interest]
+odds_chart = (
+    alt.Chart(
+        odds_year,
+        title = 'Playoff Odds by Week'
+    ).mark_line(point = True).encode(
+        x = alt.X('week:O', axis = alt.Axis(labelAngle = 0)).title('After Week'),
+        y = alt.Y('playoff:Q').title('Playoff Odds').axis(format = '%'),
+        color = alt.Color('manager:N', scale = alt.Scale(scheme = 'category20')).title('Manager'),
+        tooltip = ['manager', 'week', alt.Tooltip('playoff:Q', format = '.1%'), alt.Tooltip('bye:Q', format = '.1%'), alt.Tooltip('last_place:Q', format = '.1%')]
+    ).interactive()
+)
+st.altair_chart(odds_chart, use_container_width = True)
 
 st.divider()
 
@@ -201,6 +202,15 @@ st.divider()
 #%% Optimal Lineups
 st.subheader('Optimal Lineups')
 
+# lineup comparisons for the selected season only, loaded once the page gets this far
+all_scores_df = league_table('comparisons_score')
+all_scores_df = with_names(all_scores_df[all_scores_df['year'] == season_of_interest], manager_dim)
+all_comps_df = league_table('comparisons_df')
+all_comps_df = with_names(all_comps_df[all_comps_df['year'] == season_of_interest], manager_dim)
+if all_scores_df.shape[0] == 0:
+    st.write('No box scores are available for this season.')
+    st.stop()
+
 manager_of_interest = st.selectbox(
     'Manager',
     all_scores_df['manager'].unique()
@@ -268,34 +278,30 @@ st.subheader('Lineup Accuracy')
 
 opt_acc1 = (
     all_scores_df[all_scores_df['type'] != 'projected']
-    .groupby(['manager'], as_index = False)
+    .groupby(['manager'], as_index = False)['score']
     .sum()
-    .drop(['type', 'week'], axis = 1)
     .rename(columns = {'score': 'Optimal'})
 )
 opt_acc2 = (
     all_scores_df[all_scores_df['type'] == 'original']
-    .groupby(['manager'], as_index = False)
+    .groupby(['manager'], as_index = False)['score']
     .sum()
     .rename(columns = {'score': 'Original'})
-    .drop(['type', 'week'], axis = 1)
 )
 opt_acc3 = pd.merge(opt_acc1, opt_acc2, on = ['manager'])
 opt_acc3['pct'] = round(opt_acc3['Original'] / opt_acc3['Optimal'] * 100, 2)
 
 prj_acc1 = (
     all_scores_df[all_scores_df['type'] == 'projected']
-    .groupby(['manager'], as_index = False)
+    .groupby(['manager'], as_index = False)['score']
     .sum()
-    .drop(['type', 'week'], axis = 1)
     .rename(columns = {'score': 'Projected'})
 )
 prj_acc2 = (
     all_scores_df[all_scores_df['type'] == 'original']
-    .groupby(['manager'], as_index = False)
+    .groupby(['manager'], as_index = False)['score']
     .sum()
     .rename(columns = {'score': 'Original'})
-    .drop(['type', 'week'], axis = 1)
 )
 prj_acc3 = pd.merge(prj_acc1, prj_acc2, on = ['manager'])
 prj_acc3['pct'] = round(prj_acc3['Original'] / prj_acc3['Projected'] * 100, 2)
@@ -6,11 +6,16 @@ import altair as alt
 import streamlit as st
 from streamlit import session_state as ss
 
+from ffa.datasets import import_notice, league_table, league_years
+from ffa.managers import with_names
+
 #%% Season-Level
 st.header('Historical Transactions')
 
 # Raw Data
-acq_df = ss['acqusition']
+import_notice()
+manager_dim = league_table('managers')
+acq_df = with_names(league_table('acquisitions'), manager_dim)
 league_start = ss['start_year']
 current_year = datetime.date.today().year
 
@@ -20,9 +25,11 @@ index_2018 = np.where(all_years == 2018)
 if index_2018[0].shape[0] == 1:
     all_years = np.delete(all_years, index_2018)
 
+# only the seasons that are in, while an import is still running
+all_years = league_years(all_years)
+
 # Make it Long for Display
 acq_df.columns = ['Manager', 'Pickups', 'Trades', 'FAAB Spent', 'Year']
-acq_df['Year'] = acq_df['Year'].astype(int)
 acq_df_wide = (acq_df.pivot_table(index = 'Manager',
 								  columns = 'Year',
 								  values = ['Pickups', 'Trades', 'FAAB Spent'])
@@ -41,8 +48,7 @@ years = st.multiselect('Display which years?',
 
 # acq_df_wide.fillna('', inplace = True)
 acquistions_df = acq_df_wide[(acq_df_wide['Metric'].isin(metrics)) & (acq_df_wide['Year'].isin(years))]
-acquistions_df['Year'] = acquistions_df['Year'].astype(str)
-st.dataframe(acquistions_df, hide_index = True)
+st.dataframe(acquistions_df, hide_index = True, column_config = {'Year': st.column_config.NumberColumn(format = '%d')})
 
 
 #%% Time Series of Acquisition Metrics
@@ -0,0 +1,32 @@
+from types import SimpleNamespace
+
+from ffa import access
+
+
+def test_open_leagues_come_from_the_deployment(monkeypatch):
+    monkeypatch.setenv('FFA_OPEN_LEAGUES', '298982, 17')
+    assert access.open_leagues() == [298982, 17]
+
+    monkeypatch.delenv('FFA_OPEN_LEAGUES')
+    assert access.open_leagues() == []
+
+
+def test_credentials_digest_tells_cookie_pairs_apart():
+    assert access.credentials_digest('a', 'b') == access.credentials_digest('a', 'b')
+    assert access.credentials_digest('a', 'b') != access.credentials_digest('b', 'a')
+    assert 'secret' not in access.credentials_digest('secret', 'b')
+
+
+def test_cookies_are_checked_with_espn_not_the_cache(monkeypatch):
+    calls = []
+
+    def get(url, params = None, cookies = None, timeout = None):
+        calls.append((url, cookies, timeout))
+        return SimpleNamespace(status_code = 200 if cookies['espn_s2'] == 'good' else 401)
+
+    monkeypatch.setattr(access.requests, 'get', get)
+
+    assert access.cookies_accepted(298982, 'good', '{SWID}', year = 2024)
+    assert not access.cookies_accepted(298982, 'bad', '{SWID}', year = 2024)
+    assert calls[0][0].endswith('/seasons/2024/segments/0/leagues/298982')
+    assert calls[0][2] is not None
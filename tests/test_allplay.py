@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+
+from ffa.allplay import all_play_records
+
+
+def weekly_aggregate(week_df):
+    """
+    the page's original week-by-week all-play loop, kept as the reference
+    """
+    total_teams = week_df['manager'].nunique()
+    scores = (week_df.sort_values(by = ['points_for'])
+                     .reset_index(drop = True)
+                     .assign(total_wins = np.arange(0, total_teams, 1),
+                             total_loss = np.arange(total_teams - 1, -1, -1)))
+
+    # equal scores share the lowest wins and losses of their group and tie each other
+    for points in scores.loc[scores.duplicated(subset = 'points_for', keep = False), 'points_for'].unique():
+        tied = scores['points_for'] == points
+        scores.loc[tied, 'total_wins'] = scores.loc[tied, 'total_wins'].min()
+        scores.loc[tied, 'total_loss'] = scores.loc[tied, 'total_loss'].min()
+    scores['total_ties'] = total_teams - 1 - scores['total_wins'] - scores['total_loss']
+
+    return scores
+
+
+def toy_scores(seed = 0):
+    # scores rounded to whole points so ties are common
+    rng = np.random.default_rng(seed)
+    rows = []
+    for year in [2020, 2021]:
+        for week in range(1, 8):
+            for manager in range(6):
+                outcome = 'U' if year == 2021 and week > 5 else 'W'
+                game_type = 'postseason' if week == 7 else 'season'
+                rows.append((manager, outcome, float(rng.integers(80, 90)), game_type, week, year))
+
+    return pd.DataFrame(rows, columns = ['manager', 'outcome', 'points_for', 'game_type', 'week', 'year'])
+
+
+def test_all_play_matches_the_weekly_loop():
+    scores_df = toy_scores()
+    played = scores_df[(scores_df['outcome'] != 'U') & (scores_df['game_type'] == 'season')]
+    expected = pd.concat([weekly_aggregate(week_df) for _, week_df in played.groupby(['year', 'week'])])
+
+    records = all_play_records(scores_df)
+
+    key = ['year', 'week', 'manager']
+    columns = key + ['total_wins', 'total_loss', 'total_ties']
+    pd.testing.assert_frame_equal(records.loc[:, columns].sort_values(key).reset_index(drop = True),
+                                  expected.loc[:, columns].sort_values(key).reset_index(drop = True),
+                                  check_dtype = False)
@@ -0,0 +1,54 @@
+import os
+import time
+
+import requests
+from espn_api.requests import espn_requests
+
+from ffa.cache import REQUEST_TIMEOUT, CachedEspnRequests, ResponseCache, season_end
+
+
+def cached(tmp_path, written):
+    cache = ResponseCache(cache_dir = tmp_path, current_year = 2025)
+    path = cache.path(1, 2024, 'league', 0, 'abc')
+    cache.put(path, {'status': 'ok'})
+    os.utime(path, (written, written))
+
+    return cache, path
+
+
+def test_past_season_written_after_it_ended_is_permanent(tmp_path):
+    cache, path = cached(tmp_path, season_end(2024) + 60)
+
+    assert cache.get(path, 2024) == {'status': 'ok'}
+
+
+def test_past_season_written_mid_season_expires(tmp_path):
+    # cached during the 2024 season, read after the calendar rolled over
+    cache, path = cached(tmp_path, season_end(2024) - 90 * 24 * 60 * 60)
+
+    assert cache.get(path, 2024) is None
+
+
+def test_recent_mid_season_response_is_fresh_within_ttl(tmp_path):
+    cache, path = cached(tmp_path, time.time())
+
+    assert cache.get(path, 2025) == {'status': 'ok'}
+
+
+class Response:
+    status_code = 200
+
+    def json(self):
+        return [{'id': 1}]
+
+
+def test_espn_requests_get_a_socket_timeout_without_patching_espn_api(tmp_path, monkeypatch):
+    seen = []
+    monkeypatch.setattr(requests, 'get', lambda *args, **kwargs: seen.append(kwargs) or Response())
+    request = CachedEspnRequests(sport = 'nfl', year = 2016, league_id = 1, cache = ResponseCache(tmp_path, current_year = 2024))
+
+    # leagueHistory wraps the league in a list
+    assert request.league_get(params = {'view': 'mSettings'}) == {'id': 1}
+    assert request.get(params = {'view': 'proTeamSchedules'}) == [{'id': 1}]
+    assert [kwargs['timeout'] for kwargs in seen] == [REQUEST_TIMEOUT] * 2
+    assert espn_requests.requests is requests
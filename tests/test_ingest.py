@@ -0,0 +1,48 @@
+import pandas as pd
+
+from ffa.ingest import merge_master_data, refresh_years
+
+
+def master(scores, lineup_weeks, manager_names):
+    """
+    a toy master tuple: `scores` are (year, week, outcome), lineups are stored for `lineup_weeks` (year, week)
+    """
+    scores_df = pd.DataFrame([(year, week, outcome, 1) for year, week, outcome in scores], columns = ['year', 'week', 'outcome', 'manager'])
+    years = sorted(set(scores_df['year']))
+    season_df = pd.DataFrame({'year': years, 'value': [f'{year} v{len(scores)}' for year in years]})
+    weekly_df = pd.DataFrame([(year, week, f'{year}-{week} v{len(scores)}') for year, week in lineup_weeks], columns = ['year', 'week', 'value'])
+
+    return (scores_df, season_df.rename(columns = {'year': 'Year'}), season_df, season_df, weekly_df, weekly_df, weekly_df,
+            season_df, season_df, pd.DataFrame({'manager_key': [1], 'manager': manager_names}))
+
+
+def test_refresh_years_picks_unfinished_and_missing_seasons():
+    stored = master([(2019, 1, 'W'), (2019, 2, 'L'), (2020, 1, 'W'), (2020, 2, 'U')], [(2019, 1), (2019, 2), (2020, 1)], ['Al'])
+
+    assert refresh_years(None, 2019, current_year = 2021) == [2019, 2020, 2021]
+    assert refresh_years(stored, 2019, current_year = 2021) == [2020, 2021]
+
+    # a finished season without lineup comparisons is done, one without its settings never landed whole
+    no_lineups = stored[:5] + (stored[5][stored[5]['year'] != 2019],) + stored[6:]
+    assert refresh_years(no_lineups, 2019, current_year = 2021) == [2020, 2021]
+    no_settings = stored[:8] + (stored[8][stored[8]['year'] != 2019],) + stored[9:]
+    assert refresh_years(no_settings, 2019, current_year = 2021) == [2019, 2020, 2021]
+
+
+def test_merge_replaces_seasons_whole_and_lineups_by_week():
+    stored = master([(2019, 1, 'W'), (2019, 2, 'L'), (2020, 1, 'W'), (2020, 2, 'U')], [(2019, 1), (2019, 2), (2020, 1)], ['Al'])
+    new = master([(2020, 1, 'W'), (2020, 2, 'L')], [(2020, 2)], ['Al B.'])
+
+    merged = merge_master_data(stored, new)
+
+    scores_df = merged[0]
+    assert scores_df.loc[:, ['year', 'week', 'outcome']].values.tolist() == [[2019, 1, 'W'], [2019, 2, 'L'], [2020, 1, 'W'], [2020, 2, 'L']]
+    assert merged[1]['value'].tolist() == ['2019 v4', '2020 v2']
+    assert merged[8]['value'].tolist() == ['2019 v4', '2020 v2']
+
+    # week 1 of 2020 was stored before and is kept, week 2 comes from the refresh
+    assert merged[5]['value'].tolist() == ['2019-1 v4', '2019-2 v4', '2020-1 v4', '2020-2 v2']
+
+    # the manager dimension is the refreshed one
+    assert merged[-1]['manager'].tolist() == ['Al B.']
+    assert len(merged) == len(stored)
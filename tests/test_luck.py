@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+
+from ffa.luck import schedule_swaps
+
+
+def swap_record(season_df, manager, schedule_of):
+    """
+    one manager's record under another's schedule, one week at a time
+    """
+    wins = losses = ties = 0
+    for _, week_df in season_df.groupby('week'):
+        scores = week_df.set_index('manager')['points_for']
+        opponent = week_df.set_index('manager')['opponent'][schedule_of]
+        if opponent == manager:
+            opponent = schedule_of
+        wins += scores[manager] > scores[opponent]
+        losses += scores[manager] < scores[opponent]
+        ties += scores[manager] == scores[opponent]
+
+    return wins, losses, ties
+
+
+def toy_scores(seed = 0):
+    rng = np.random.default_rng(seed)
+    rows = []
+    for year in [2020, 2021]:
+        for week in range(1, 7):
+            order = rng.permutation(6)
+            points = rng.integers(80, 90, size = 6).astype(float)
+            for home, away in zip(order[::2], order[1::2]):
+                rows.append((away, 'W', points[home], home, 'season', week, year))
+                rows.append((home, 'W', points[away], away, 'season', week, year))
+
+    return pd.DataFrame(rows, columns = ['opponent', 'outcome', 'points_for', 'manager', 'game_type', 'week', 'year'])
+
+
+def test_schedule_swaps_match_the_weekly_loop():
+    scores_df = toy_scores()
+
+    swaps = schedule_swaps(scores_df)
+
+    for row in swaps.itertuples():
+        season_df = scores_df[scores_df['year'] == row.year]
+        assert (row.wins, row.losses, row.ties) == swap_record(season_df, row.manager, row.schedule_of)
+
+
+def test_own_schedule_is_the_real_record():
+    scores_df = toy_scores()
+    with_opponent = pd.merge(scores_df, scores_df.loc[:, ['manager', 'week', 'year', 'points_for']],
+                             left_on = ['opponent', 'week', 'year'], right_on = ['manager', 'week', 'year'], suffixes = ('', '_against'))
+    real_wins = (with_opponent['points_for'] > with_opponent['points_for_against']).groupby([with_opponent['year'], with_opponent['manager']]).sum()
+
+    swaps = schedule_swaps(scores_df)
+    own = swaps[swaps['manager'] == swaps['schedule_of']].set_index(['year', 'manager'])['wins']
+
+    assert own.sort_index().tolist() == real_wins.sort_index().tolist()
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+
+from ffa import playoffs
+from ffa import store
+
+
+def season(year, teams = 4, weeks = 6, played_weeks = 6, seed = 0):
+    rng = np.random.default_rng(seed + year)
+    rows = []
+    for week in range(1, weeks + 1):
+        order = rng.permutation(teams)
+        for home, away in zip(order[::2], order[1::2]):
+            home_score, away_score = rng.normal(100, 20, size = 2).round(2)
+            for team, opponent, points_for, points_against in [(home, away, home_score, away_score), (away, home, away_score, home_score)]:
+                outcome = 'U' if week > played_weeks else 'W' if points_for > points_against else 'L'
+                rows.append((opponent, outcome, points_for, team, 'season', week, year))
+
+    return pd.DataFrame(rows, columns = ['opponent', 'outcome', 'points_for', 'manager', 'game_type', 'week', 'year'])
+
+
+def test_byes_fill_the_bracket_up_to_a_power_of_two():
+    assert [playoffs.playoff_byes(teams) for teams in [2, 3, 4, 6, 7, 8]] == [0, 1, 0, 2, 1, 0]
+
+
+def test_simulation_reads_each_seasons_playoff_format():
+    scores_df = pd.concat([season(2020, teams = 6, played_weeks = 3), season(2021, teams = 6, played_weeks = 3)])
+    settings_df = pd.DataFrame({'playoff_team_count': [4, 6], 'year': [2020, 2021]})
+
+    odds = playoffs.weekly_playoff_odds(scores_df, settings_df, simulations = 2_000)
+    final = odds[odds['week'] == 3].groupby('year')[['playoff', 'bye']].sum()
+
+    # every simulated season sends exactly that many teams to the playoffs and gives out its byes
+    assert np.allclose(final.loc[2020], [4, 0])
+    assert np.allclose(final.loc[2021], [6, 2])
+
+
+def test_only_seasons_without_stored_odds_are_simulated():
+    scores_df = pd.concat([season(2020), season(2021, played_weeks = 2)])
+    settings_df = pd.DataFrame({'playoff_team_count': [4, 4], 'year': [2020, 2021]})
+    stored_df = playoffs.weekly_playoff_odds(scores_df, settings_df, years = [2020], simulations = 500)
+    stored_df['playoff'] = -1.0
+
+    odds = store.update_seasonal_table(stored_df, 'playoff_odds', [scores_df, settings_df], [2020, 2021])
+
+    assert (odds.loc[odds['year'] == 2020, 'playoff'] == -1.0).all()
+    assert odds.loc[odds['year'] == 2021, 'week'].unique().tolist() == [1, 2]
+    assert odds['year'].is_monotonic_increasing
+
+
+def test_head_to_head_tiebreak_overrides_points_for():
+    # a round robin where A and B finish 2-1 with A beating B, C and D finish 1-2 with C beating D,
+    # but B and D outscore A and C over the season
+    games = [(1, 'A', 'B', 100, 90), (1, 'C', 'D', 100, 90),
+             (2, 'A', 'C', 100, 90), (2, 'B', 'D', 150, 80),
+             (3, 'D', 'A', 150, 90), (3, 'B', 'C', 150, 80)]
+    rows = []
+    for week, winner, loser, winner_score, loser_score in games:
+        rows.append((loser, 'W', winner_score, winner, 'season', week, 2020))
+        rows.append((winner, 'L', loser_score, loser, 'season', week, 2020))
+    scores_df = pd.DataFrame(rows, columns = ['opponent', 'outcome', 'points_for', 'manager', 'game_type', 'week', 'year'])
+    settings_df = pd.DataFrame({'playoff_team_count': [2], 'playoff_seed_tie_rule': [playoffs.H2H_TIE_RULE], 'year': [2020]})
+
+    h2h = playoffs.weekly_playoff_odds(scores_df, settings_df, simulations = 10).query('week == 3').set_index('manager')
+    points = playoffs.weekly_playoff_odds(scores_df, settings_df.drop(columns = 'playoff_seed_tie_rule'), simulations = 10).query('week == 3').set_index('manager')
+
+    assert h2h['mean_seed'].sort_values().index.tolist() == ['A', 'B', 'C', 'D']
+    assert points['mean_seed'].sort_values().index.tolist() == ['B', 'A', 'D', 'C']
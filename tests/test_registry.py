@@ -0,0 +1,89 @@
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from ffa.registry import DatasetRegistry, frame_nbytes, freeze
+
+
+def test_one_load_per_table_for_concurrent_sessions():
+    registry = DatasetRegistry()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        time.sleep(0.1)
+        return pd.DataFrame({'year': [2020]})
+
+    threads = [threading.Thread(target = registry.load, args = (1, 'scores', loader)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+
+
+def test_a_slow_table_does_not_hold_up_the_others():
+    registry = DatasetRegistry()
+    release = threading.Event()
+
+    def slow_loader():
+        release.wait(5)
+        return pd.DataFrame({'year': [2020]})
+
+    slow = threading.Thread(target = registry.load, args = (1, 'player_weeks', slow_loader))
+    slow.start()
+    time.sleep(0.05)
+
+    # another table of the same league, and the same table of another league, load while the slow one is still reading
+    start = time.perf_counter()
+    registry.load(1, 'scores', lambda: pd.DataFrame({'year': [2020]}))
+    registry.load(2, 'player_weeks', lambda: pd.DataFrame({'year': [2020]}))
+    elapsed = time.perf_counter() - start
+
+    release.set()
+    slow.join()
+
+    assert elapsed < 1
+    assert registry.get(1, 'player_weeks') is not None
+
+
+def test_least_recently_used_tables_are_dropped_past_the_budget():
+    df = pd.DataFrame({'year': range(100)})
+    registry = DatasetRegistry(budget = 2 * frame_nbytes(freeze(df)))
+    for name in ['scores', 'standings']:
+        registry.load(1, name, lambda: df)
+
+    # reading scores makes standings the least recently used, so the third table pushes it out
+    registry.get(1, 'scores')
+    registry.load(1, 'draft', lambda: df)
+
+    assert [name for name in ['scores', 'standings', 'draft'] if registry.get(1, name) is not None] == ['scores', 'draft']
+    assert registry.nbytes <= registry.budget
+    assert set(registry._load_locks) == {(1, 'scores'), (1, 'draft')}
+
+
+def test_discard_drops_a_leagues_tables_and_load_locks():
+    registry = DatasetRegistry()
+    registry.load(1, 'scores', lambda: pd.DataFrame({'year': [2020]}))
+    registry.load(1, 'missing', lambda: None)
+    registry.load(2, 'scores', lambda: pd.DataFrame({'year': [2020]}))
+
+    registry.discard(1)
+
+    assert registry.leagues() == [2]
+    assert set(registry._load_locks) == {(2, 'scores')}
+
+
+def test_held_tables_reject_in_place_writes():
+    registry = DatasetRegistry()
+    df = registry.load(1, 'scores', lambda: pd.DataFrame({'year': [2020, 2021], 'points': [100.0, 90.0]}))
+
+    with pytest.raises(ValueError, match = 'read-only'):
+        df.loc[0, 'points'] = 0.0
+    with pytest.raises(ValueError, match = 'read-only'):
+        df['year'].to_numpy()[0] = 0
+
+    assert registry.get(1, 'scores')['points'].tolist() == [100.0, 90.0]
@@ -0,0 +1,62 @@
+import asyncio
+import threading
+import time
+
+import pytest
+import requests
+
+from ffa.scheduler import TokenBucket, fetch_all
+
+
+def test_results_come_back_in_order():
+    assert fetch_all(lambda x: x * 2, [(i,) for i in range(20)], rate = 1000, burst = 1000) == [i * 2 for i in range(20)]
+
+
+def test_transient_errors_are_retried():
+    attempts = []
+
+    def flaky(x):
+        attempts.append(x)
+        if len(attempts) == 1:
+            raise requests.ConnectionError('reset')
+        return x
+
+    assert fetch_all(flaky, [(1,)], backoff = 0) == [1]
+    assert len(attempts) == 2
+
+
+def test_a_hung_call_does_not_block_past_its_timeout():
+    release = threading.Event()
+
+    def hang(x):
+        release.wait(5)
+        return x
+
+    start = time.monotonic()
+    with pytest.raises(asyncio.TimeoutError):
+        fetch_all(hang, [(1,)], retries = 0, timeout = 0.2)
+    release.set()
+
+    assert time.monotonic() - start < 2
+
+
+def test_works_inside_a_running_event_loop():
+    async def notebook_cell():
+        return fetch_all(lambda x: x + 1, [(1,), (2,)])
+
+    assert asyncio.run(notebook_cell()) == [2, 3]
+
+
+def test_seasons_fetching_at_once_share_one_rate_limit():
+    # two seasons' box scores on two threads: 20 calls at 20 per second with no burst take about a second
+    bucket = TokenBucket(rate = 20, capacity = 1)
+    threads = [threading.Thread(target = fetch_all, args = (lambda x: x, [(i,) for i in range(10)]), kwargs = {'bucket': bucket})
+               for _ in range(2)]
+
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert time.perf_counter() - start > 0.9
@@ -0,0 +1,65 @@
+import random
+
+import pytest
+
+from ffa.lineups import LineupPlayer
+from ffa.solver import solve_lineups
+
+POSITIONS = {'QB': 1, 'RB': 2, 'WR': 1, 'RB/WR': 1, 'TE': 1, 'RB/WR/TE': 1, 'D/ST': 1, 'BE': 5, 'IR': 1}
+ELIGIBLE_SLOTS = {'QB': ['QB', 'BE', 'IR'],
+                  'RB': ['RB', 'RB/WR', 'RB/WR/TE', 'BE', 'IR'],
+                  'WR': ['WR', 'RB/WR', 'RB/WR/TE', 'BE', 'IR'],
+                  'TE': ['TE', 'RB/WR/TE', 'BE', 'IR'],
+                  'D/ST': ['D/ST', 'BE', 'IR']}
+
+
+def brute_force(positions, lineup):
+    """
+    best score over every way of putting distinct eligible players (or nobody) in each starting slot
+    """
+    slots = [slot for slot, count in positions.items() if slot not in ['BE', 'IR'] for _ in range(count)]
+
+    def best(i, used):
+        if i == len(slots):
+            return 0.0
+        score = best(i + 1, used)
+        for p, player in enumerate(lineup):
+            if p not in used and slots[i] in player.eligibleSlots:
+                score = max(score, player.points + best(i + 1, used | {p}))
+        return score
+
+    return best(0, frozenset())
+
+
+def random_lineup(rng):
+    # short benches and negative scores make empty slots and benched negatives show up
+    lineup = []
+    for position, eligible_slots in ELIGIBLE_SLOTS.items():
+        for k in range(rng.randint(0, 3)):
+            lineup.append(LineupPlayer(f'{position} {k}', 'BE', eligible_slots, round(rng.uniform(-8, 25), 1), 0.0))
+
+    return lineup
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_solver_matches_brute_force(seed):
+    rng = random.Random(seed)
+    lineups = [random_lineup(rng) for _ in range(40)]
+
+    for lineup, (positions, names, score) in zip(lineups, solve_lineups(POSITIONS, lineups)):
+        assert score == pytest.approx(brute_force(POSITIONS, lineup))
+
+        # the lineup it reports is a real one that adds up to the score
+        players = {player.name: player for player in lineup}
+        started = [(slot, name) for slot, name in zip(positions, names) if name is not None]
+        assert len(set(name for _, name in started)) == len(started)
+        assert all(slot in players[name].eligibleSlots for slot, name in started)
+        assert sum(players[name].points for _, name in started) == pytest.approx(score)
+
+
+def test_negative_scorers_stay_on_the_bench():
+    lineup = [LineupPlayer('D/ST 0', 'D/ST', ELIGIBLE_SLOTS['D/ST'], -4.0, 0.0)]
+
+    positions, names, score = solve_lineups({'D/ST': 1, 'BE': 1}, [lineup])[0]
+
+    assert (positions, names, score) == (['D/ST'], [None], 0.0)
@@ -0,0 +1,25 @@
+from pathlib import Path
+
+from benchmarks.ingest_builders import synthetic_league
+from ffa import ingest
+from ffa import store
+from ffa import warehouse
+
+LEAGUE_ID = 987654
+
+
+def test_build_into_a_custom_warehouse(tmp_path, monkeypatch):
+    # seasons before box scores existed, so the made-up league needs no lineups
+    monkeypatch.setattr(ingest, 'CachedLeague', lambda league_id, year, espn_s2, swid, cache = None: synthetic_league(year))
+    root = tmp_path / 'other'
+
+    store.build_store(LEAGUE_ID, 2015, 's2', 'swid', current_year = 2016, root = root)
+
+    built = sorted(path.parent.name for path in root.glob(f'*/league_id={LEAGUE_ID}'))
+    assert {'players', 'managers', 'scores', 'season_settings', 'playoff_odds'} <= set(built)
+    assert not (Path(warehouse.WAREHOUSE_DIR) / 'players' / f'league_id={LEAGUE_ID}').exists()
+
+    # a full rebuild keeps the manager keys it finds under the same root
+    keys = warehouse.load_table('managers', LEAGUE_ID, root = root)
+    store.build_store(LEAGUE_ID, 2015, 's2', 'swid', full = True, current_year = 2016, root = root)
+    assert warehouse.load_table('managers', LEAGUE_ID, root = root).equals(keys)
@@ -0,0 +1,46 @@
+import pandas as pd
+
+from ffa.streaks import longest_streaks, streak_index
+
+
+def games(manager, results):
+    return pd.DataFrame([(manager, year, week, outcome) for year, week, outcome in results],
+                        columns = ['manager', 'year', 'week', 'outcome'])
+
+
+def test_streaks_carry_across_seasons():
+    scores_df = games(1, [(2020, 13, 'W'), (2020, 14, 'W'), (2021, 1, 'W'), (2021, 2, 'L')])
+
+    streaks = streak_index(scores_df)
+
+    assert streaks.loc[:, ['outcome', 'length', 'start_year', 'start_week', 'end_year', 'end_week']].values.tolist() == [
+        ['W', 3, 2020, 13, 2021, 1],
+        ['L', 1, 2021, 2, 2021, 2],
+    ]
+
+
+def test_streaks_never_run_across_managers():
+    # the last game of one manager and the first of the next are both wins, but they are two streaks
+    scores_df = pd.concat([games(2, [(2020, 1, 'W'), (2020, 2, 'W')]),
+                           games(1, [(2020, 1, 'L'), (2020, 2, 'W')])])
+
+    streaks = streak_index(scores_df)
+
+    assert streaks.loc[:, ['manager', 'outcome', 'length']].values.tolist() == [[1, 'L', 1], [1, 'W', 1], [2, 'W', 2]]
+
+
+def test_games_are_ordered_before_streaks_are_cut():
+    scores_df = games(1, [(2021, 1, 'W'), (2020, 2, 'L'), (2020, 1, 'W'), (2020, 3, 'W')])
+
+    streaks = streak_index(scores_df)
+
+    assert streaks['length'].tolist() == [1, 1, 2]
+    assert streaks['length'].sum() == scores_df.shape[0]
+
+
+def test_longest_streaks_inside_a_range_of_years():
+    scores_df = games(1, [(2019, 14, 'W'), (2020, 1, 'W'), (2020, 2, 'L'), (2020, 3, 'W'), (2020, 4, 'W')])
+    streaks = streak_index(scores_df)
+
+    # the two-game streak starting in 2019 is left out of a 2020-only range
+    assert longest_streaks(streaks, 'W', years = [2020]).loc[:, ['start_year', 'start_week', 'length']].values.tolist() == [[2020, 3, 2]]
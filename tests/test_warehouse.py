@@ -0,0 +1,68 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from ffa import warehouse
+
+
+def scores(years):
+    return pd.DataFrame({'year': years, 'points_for': [100.0] * len(years)})
+
+
+def test_rewrite_drops_seasons_the_table_no_longer_has(tmp_path):
+    warehouse.write_table(scores([2019, 2020, 2021]), 'scores', 1, tmp_path)
+    warehouse.write_table(scores([2020, 2021]), 'scores', 1, tmp_path)
+
+    assert warehouse.table_years('scores', 1, tmp_path) == [2020, 2021]
+    assert warehouse.load_table('scores', 1, root = tmp_path)['year'].tolist() == [2020, 2021]
+
+
+def test_partial_write_keeps_the_other_seasons(tmp_path):
+    warehouse.write_table(scores([2019, 2020]), 'scores', 1, tmp_path)
+    warehouse.write_table(scores([2021]), 'scores', 1, tmp_path, years = [2021])
+
+    assert warehouse.table_years('scores', 1, tmp_path) == [2019, 2020, 2021]
+
+
+def test_partial_write_drops_an_emptied_season(tmp_path):
+    warehouse.write_table(scores([2019, 2020]), 'scores', 1, tmp_path)
+    warehouse.write_table(scores([2019]), 'scores', 1, tmp_path, years = [2020])
+
+    assert warehouse.table_years('scores', 1, tmp_path) == [2019]
+
+
+def test_other_leagues_are_untouched(tmp_path):
+    warehouse.write_table(scores([2019]), 'scores', 1, tmp_path)
+    warehouse.write_table(scores([2020]), 'scores', 2, tmp_path)
+
+    assert warehouse.table_years('scores', 1, tmp_path) == [2019]
+
+
+def test_concurrent_writers_of_a_partition_never_share_a_temp_file(tmp_path):
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(lambda i: warehouse.write_table(scores([2020] * (i + 1)), 'scores', 1, tmp_path), range(16)))
+
+    assert warehouse.table_years('scores', 1, tmp_path) == [2020]
+    assert list(tmp_path.rglob('*.tmp')) == []
+
+
+def test_league_lock_serializes_builds_of_one_league(tmp_path):
+    inside = []
+    overlaps = []
+
+    def build(league_id):
+        with warehouse.league_lock(league_id, tmp_path):
+            inside.append(league_id)
+            overlaps.append(inside.count(league_id) > 1)
+            time.sleep(0.05)
+            inside.remove(league_id)
+
+    threads = [threading.Thread(target = build, args = (league_id,)) for league_id in [1, 1, 1, 2]]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not any(overlaps)
@@ -0,0 +1,57 @@
+from types import SimpleNamespace
+
+import pandas as pd
+
+from ffa.lineups import LineupPlayer, scoring_period_matchups, week_task
+from ffa.win_shares import win_shares
+
+
+def player_weeks(rows):
+    return pd.DataFrame(rows, columns = ['year', 'week', 'matchup_period', 'manager', 'player_id', 'player', 'position', 'slot', 'points'])
+
+
+def test_scoring_periods_map_to_their_matchup():
+    settings = SimpleNamespace(matchup_periods = {'1': [1], '2': [2], '3': [3, 4]})
+
+    assert scoring_period_matchups(settings) == {1: 1, 2: 2, 3: 3, 4: 3}
+    assert scoring_period_matchups(SimpleNamespace()) == {}
+
+
+def test_week_task_tags_the_matchup_period():
+    team = SimpleNamespace(owners = [{'id': '{A}'}])
+    box_score = SimpleNamespace(home_team = team, home_lineup = [SimpleNamespace(name = 'QB', lineupSlot = 'QB', eligibleSlots = ['QB'], points = 10.0,
+                                                                                  projected_points = 12.0, playerId = 1, position = 'QB')],
+                                away_team = 0, away_lineup = [])
+    league = SimpleNamespace(year = 2023, settings = SimpleNamespace(position_slot_counts = {'QB': 1}, matchup_periods = {'15': [15, 16]}))
+
+    year, week, _, teams, matchup_period = week_task(league, 16, [box_score])
+
+    assert (year, week, matchup_period) == (2023, 16, 15)
+    assert teams == [('{A}', [LineupPlayer('QB', 'QB', ['QB'], 10.0, 12.0, 1, 'QB', {})])]
+
+
+def test_two_week_playoff_round_counts_once_towards_its_game():
+    # manager 0 wins the two-week round (matchup 15, scoring periods 15 and 16) 50-40, manager 1 loses it
+    scores = pd.DataFrame({'year': [2023, 2023], 'week': [15, 15], 'manager': [0, 1], 'outcome': ['W', 'L'], 'points_for': [50.0, 40.0]})
+    weeks = player_weeks([
+        [2023, 15, 15, 0, 1, 'A', 'QB', 'QB', 20.0],
+        [2023, 16, 15, 0, 1, 'A', 'QB', 'QB', 10.0],
+        [2023, 16, 15, 0, 2, 'B', 'RB', 'RB', 20.0],
+        [2023, 16, 15, 0, 3, 'C', 'WR', 'BE', 30.0],
+        [2023, 16, 15, 1, 4, 'D', 'QB', 'QB', 40.0],
+    ])
+
+    shares = win_shares(weeks, scores)
+
+    assert shares['week'].tolist() == [15, 15]
+    assert shares['player_id'].tolist() == [1, 2]
+    assert shares['points'].tolist() == [30.0, 20.0]
+    assert shares['win_share'].sum() == 1.0
+
+
+def test_scoring_period_past_the_last_matchup_gets_no_credit():
+    # the second week of the round must not land on a (nonexistent) game 16
+    scores = pd.DataFrame({'year': [2023, 2023], 'week': [15, 16], 'manager': [0, 0], 'outcome': ['L', 'W'], 'points_for': [40.0, 60.0]})
+    weeks = player_weeks([[2023, 16, 15, 0, 1, 'A', 'QB', 'QB', 25.0]])
+
+    assert win_shares(weeks, scores).shape[0] == 0